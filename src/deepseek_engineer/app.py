@@ -2,7 +2,7 @@
 
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Mapping
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -340,11 +340,11 @@ class DeepSeekEngineer:
                 )
                 raise
     
-    def get_available_tools(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_available_tools(self) -> Mapping[str, List[Dict[str, Any]]]:
         """Get all available plugin tools."""
         return self.mcp.get_available_tools()
     
-    def get_available_resources(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_available_resources(self) -> Mapping[str, List[Dict[str, Any]]]:
         """Get all available plugin resources."""
         return self.mcp.get_available_resources()
     
@@ -1,19 +1,30 @@
 """Monitoring system for telemetry and logging."""
 
+import atexit
 import logging
+import logging.handlers
 import time
 import json
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass, asdict
-from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, List, Tuple
+from dataclasses import dataclass, asdict, is_dataclass
+from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
 import threading
 from queue import Queue
 import traceback
+import weakref
 import psutil
 import platform
 from contextlib import contextmanager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 @dataclass
 class Metric:
     """Represents a single metric measurement."""
@@ -30,44 +41,164 @@ class Event:
     data: Dict[str, Any]
     level: str
 
+class _Labels(dict):
+    """Label dict that can be held weakly by the intern table."""
+    __slots__ = ("__weakref__",)
+
+# Canonical label dicts keyed by their items; entries go away once no stored
+# measurement refers to them
+_LABEL_INTERN: "weakref.WeakValueDictionary[frozenset, _Labels]" = weakref.WeakValueDictionary()
+
+def _intern_labels(labels: Dict[str, str]) -> Dict[str, str]:
+    """
+    Get the shared dict for a set of labels.
+    
+    Measurements with the same labels store one dict between them; the
+    returned dict must not be modified.
+    """
+    try:
+        key = frozenset(labels.items())
+    except TypeError:
+        # Unhashable label values can't be interned
+        return labels
+    canonical = _LABEL_INTERN.get(key)
+    if canonical is None:
+        canonical = _Labels(labels)
+        _LABEL_INTERN[key] = canonical
+    return canonical
+
+def _to_ns(timestamp: datetime) -> int:
+    """Convert a datetime to nanoseconds since the epoch, exact to the microsecond."""
+    return round(timestamp.timestamp() * 1_000_000) * 1000
+
+def _from_ns(timestamp_ns: int) -> datetime:
+    """Convert nanoseconds since the epoch to a local naive datetime."""
+    seconds, ns = divmod(timestamp_ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=ns // 1000)
+
+class _MetricSeries:
+    """Measurements of one metric stored column-wise, ordered by timestamp."""
+    
+    __slots__ = ("timestamps", "values", "labels")
+    
+    def __init__(self):
+        self.timestamps: List[int] = []  # Nanoseconds since the epoch
+        self.values = array("d")
+        self.labels: List[Dict[str, str]] = []
+    
+    def add(self, timestamp_ns: int, value: float, labels: Dict[str, str]):
+        """Add a measurement, keeping the series sorted by timestamp."""
+        if not self.timestamps or timestamp_ns >= self.timestamps[-1]:
+            self.timestamps.append(timestamp_ns)
+            self.values.append(value)
+            self.labels.append(labels)
+        else:
+            i = bisect_right(self.timestamps, timestamp_ns)
+            self.timestamps.insert(i, timestamp_ns)
+            self.values.insert(i, value)
+            self.labels.insert(i, labels)
+    
+    def to_metrics(self, name: str, start: int, stop: int) -> List[Metric]:
+        """Build Metric views for the measurements in [start, stop)."""
+        return [
+            Metric(name, value, _from_ns(timestamp_ns), labels)
+            for timestamp_ns, value, labels in zip(
+                self.timestamps[start:stop],
+                self.values[start:stop],
+                self.labels[start:stop]
+            )
+        ]
+
 class MetricsAggregator:
     """Aggregates and processes metrics."""
     
     def __init__(self):
         """Initialize metrics storage."""
-        self.metrics: Dict[str, List[Metric]] = {}
+        self._series: Dict[str, _MetricSeries] = {}
         self._lock = threading.Lock()
     
+    @property
+    def metrics(self) -> Dict[str, List[Metric]]:
+        """All recorded metrics by name."""
+        with self._lock:
+            return {
+                name: series.to_metrics(name, 0, len(series.timestamps))
+                for name, series in self._series.items()
+            }
+    
+    def iter_metrics(self) -> Iterator[Metric]:
+        """
+        Iterate over all recorded metrics, one series at a time.
+        
+        Each series is copied under the lock as it is reached, so only one
+        series is held in memory at once.
+        """
+        with self._lock:
+            names = list(self._series)
+        for name in names:
+            with self._lock:
+                series = self._series.get(name)
+                if series is None:
+                    continue
+                metrics = series.to_metrics(name, 0, len(series.timestamps))
+            yield from metrics
+    
     def add_metric(self, metric: Metric):
         """Add a new metric measurement."""
+        self.add_measurement(
+            metric.name,
+            metric.value,
+            metric.labels,
+            _to_ns(metric.timestamp)
+        )
+    
+    def add_measurement(
+        self,
+        name: str,
+        value: float,
+        labels: Dict[str, str],
+        timestamp_ns: int
+    ):
+        """
+        Add a measurement without building a Metric.
+        
+        Args:
+            name: Metric name
+            value: Measured value
+            labels: Metric labels
+            timestamp_ns: Measurement time as from time.time_ns()
+        """
         with self._lock:
-            if metric.name not in self.metrics:
-                self.metrics[metric.name] = []
-            self.metrics[metric.name].append(metric)
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = _MetricSeries()
+            series.add(timestamp_ns, value, _intern_labels(labels))
     
     def get_metrics(self, name: str, 
                    start_time: Optional[datetime] = None,
                    end_time: Optional[datetime] = None) -> List[Metric]:
         """Get metrics for a given name within time range."""
         with self._lock:
-            if name not in self.metrics:
+            series = self._series.get(name)
+            if series is None:
                 return []
             
-            metrics = self.metrics[name]
-            if start_time:
-                metrics = [m for m in metrics if m.timestamp >= start_time]
-            if end_time:
-                metrics = [m for m in metrics if m.timestamp <= end_time]
-            return metrics
+            # Series are sorted, so the range is found by binary search
+            timestamps = series.timestamps
+            start = bisect_left(timestamps, _to_ns(start_time)) if start_time else 0
+            stop = bisect_right(timestamps, _to_ns(end_time)) if end_time else len(timestamps)
+            return series.to_metrics(name, start, stop)
     
     def clear_old_metrics(self, before: datetime):
         """Remove metrics older than specified time."""
+        before_ns = _to_ns(before)
         with self._lock:
-            for name in self.metrics:
-                self.metrics[name] = [
-                    m for m in self.metrics[name]
-                    if m.timestamp > before
-                ]
+            for series in self._series.values():
+                i = bisect_right(series.timestamps, before_ns)
+                if i:
+                    del series.timestamps[:i]
+                    del series.values[:i]
+                    del series.labels[:i]
 
 class EventProcessor:
     """Processes and stores system events."""
@@ -75,15 +206,24 @@ class EventProcessor:
     def __init__(self, max_events: int = 1000):
         """Initialize event storage."""
         self.max_events = max_events
-        self.events: List[Event] = []
+        self.events: deque = deque(maxlen=max_events)
+        self._by_level: Dict[str, deque] = defaultdict(deque)
         self._lock = threading.Lock()
     
     def add_event(self, event: Event):
         """Add a new event."""
+        if not self.max_events:
+            return
         with self._lock:
+            if len(self.events) == self.max_events:
+                # The oldest event is also the oldest of its level
+                evicted = self.events[0]
+                level_events = self._by_level[evicted.level]
+                level_events.popleft()
+                if not level_events:
+                    del self._by_level[evicted.level]
             self.events.append(event)
-            if len(self.events) > self.max_events:
-                self.events.pop(0)
+            self._by_level[event.level].append(event)
     
     def get_events(self, 
                   level: Optional[str] = None,
@@ -91,9 +231,10 @@ class EventProcessor:
                   end_time: Optional[datetime] = None) -> List[Event]:
         """Get events filtered by level and time range."""
         with self._lock:
-            events = self.events
             if level:
-                events = [e for e in events if e.level == level]
+                events = list(self._by_level.get(level, ()))
+            else:
+                events = list(self.events)
             if start_time:
                 events = [e for e in events if e.timestamp >= start_time]
             if end_time:
@@ -103,19 +244,32 @@ class EventProcessor:
 class PerformanceMonitor:
     """Monitors system performance metrics."""
     
-    def __init__(self):
-        """Initialize performance monitoring."""
+    def __init__(self, ttl: float = 0.5):
+        """
+        Initialize performance monitoring.
+        
+        Args:
+            ttl: Seconds to reuse the last system metrics snapshot
+        """
         self.process = psutil.Process()
+        self.ttl = ttl
+        self._cache: Optional[Tuple[float, Dict[str, float]]] = None  # (monotonic time, metrics)
     
     def get_system_metrics(self) -> Dict[str, float]:
         """Get current system performance metrics."""
-        return {
-            "cpu_percent": psutil.cpu_percent(),
+        now = time.monotonic()
+        if self._cache is not None and now - self._cache[0] < self.ttl:
+            return dict(self._cache[1])
+        
+        metrics = {
+            "cpu_percent": psutil.cpu_percent(interval=None),
             "memory_percent": psutil.virtual_memory().percent,
             "disk_usage_percent": psutil.disk_usage("/").percent,
-            "process_cpu_percent": self.process.cpu_percent(),
+            "process_cpu_percent": self.process.cpu_percent(interval=None),
             "process_memory_percent": self.process.memory_percent()
         }
+        self._cache = (now, metrics)
+        return dict(metrics)
     
     def get_process_info(self) -> Dict[str, Any]:
         """Get detailed process information."""
@@ -142,13 +296,22 @@ class MonitoringSystem:
         # Set up logging
         self._setup_logging()
         
-        # Background worker for periodic tasks
-        self._worker_queue: Queue = Queue()
+        # Background worker for periodic tasks; submit() hands it extra work
+        # through a deque, whose append and popleft are atomic, and an event
+        # to wake it up
+        self._worker_deque: deque = deque()
+        self._worker_wakeup = threading.Event()
+        self._worker_stopped = False
         self._worker_thread = threading.Thread(target=self._background_worker, daemon=True)
         self._worker_thread.start()
     
     def _setup_logging(self):
-        """Configure logging system."""
+        """
+        Configure logging system.
+        
+        Log records are put on a queue and written by a QueueListener thread,
+        so callers never block on console or file I/O.
+        """
         self.logger = logging.getLogger("deepseek_engineer")
         self.logger.setLevel(logging.INFO)
         
@@ -159,43 +322,85 @@ class MonitoringSystem:
         # Console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
+        handlers = [console_handler]
         
         # File handler if path provided
         if self.log_path:
             self.log_path.parent.mkdir(parents=True, exist_ok=True)
-            file_handler = logging.FileHandler(self.log_path)
+            file_handler = logging.handlers.RotatingFileHandler(
+                self.log_path,
+                maxBytes=10 * 1024 * 1024,
+                backupCount=5
+            )
             file_handler.setFormatter(formatter)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        self._log_queue: Queue = Queue(-1)
+        self._queue_handler = logging.handlers.QueueHandler(self._log_queue)
+        self.logger.addHandler(self._queue_handler)
+        self._log_listener = logging.handlers.QueueListener(
+            self._log_queue,
+            *handlers,
+            respect_handler_level=True
+        )
+        self._log_listener.start()
+        
+        # Flush queued records on interpreter exit
+        atexit.register(self.shutdown)
+    
+    def shutdown(self):
+        """Stop the background worker, flush queued log records and stop logging."""
+        self._worker_stopped = True
+        self._worker_wakeup.set()
+        
+        if self._log_listener is None:
+            return
+        self.logger.removeHandler(self._queue_handler)
+        self._log_listener.stop()
+        for handler in self._log_listener.handlers:
+            handler.close()
+        self._log_listener = None
+        atexit.unregister(self.shutdown)
+    
+    def submit(self, task: Callable[[], None]):
+        """Run a task on the background worker thread."""
+        self._worker_deque.append(task)
+        self._worker_wakeup.set()
     
     def _background_worker(self):
         """Background worker for periodic tasks."""
-        while True:
-            try:
-                # Collect performance metrics
-                metrics = self.performance.get_system_metrics()
-                for name, value in metrics.items():
-                    self.record_metric(name, value)
-                
-                # Clean up old metrics (keep last 24 hours)
-                self.metrics.clear_old_metrics(
-                    datetime.now() - timedelta(hours=24)
-                )
-                
-                time.sleep(60)  # Collect metrics every minute
-                
-            except Exception as e:
-                self.record_error("Background worker error", error=e)
+        next_collection = time.monotonic()
+        while not self._worker_stopped:
+            if time.monotonic() >= next_collection:
+                try:
+                    # Collect performance metrics
+                    metrics = self.performance.get_system_metrics()
+                    for name, value in metrics.items():
+                        self.record_metric(name, value)
+                    
+                    # Clean up old metrics (keep last 24 hours)
+                    self.metrics.clear_old_metrics(
+                        datetime.now() - timedelta(hours=24)
+                    )
+                    
+                except Exception as e:
+                    self.record_error("Background worker error", error=e)
+                next_collection = time.monotonic() + 60  # Collect metrics every minute
+            
+            # Sleep until the next collection or until work is submitted
+            self._worker_wakeup.wait(max(0.0, next_collection - time.monotonic()))
+            self._worker_wakeup.clear()
+            
+            while self._worker_deque:
+                task = self._worker_deque.popleft()
+                try:
+                    task()
+                except Exception as e:
+                    self.record_error("Background task error", error=e)
     
     def record_metric(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
         """Record a metric measurement."""
-        metric = Metric(
-            name=name,
-            value=value,
-            timestamp=datetime.now(),
-            labels=labels or {}
-        )
-        self.metrics.add_metric(metric)
+        self.metrics.add_measurement(name, value, labels or {}, time.time_ns())
     
     def record_event(self, name: str, data: Dict[str, Any], level: str = "INFO"):
         """Record a system event."""
@@ -255,17 +460,71 @@ class MonitoringSystem:
             ]
         }
     
-    def export_metrics(self, path: Path):
-        """Export all metrics to a file."""
-        data = {
-            name: [asdict(m) for m in metrics]
-            for name, metrics in self.metrics.metrics.items()
-        }
-        with open(path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+    def export_metrics(self, path: Path, format: str = "json"):
+        """
+        Export all metrics to a file.
+        
+        Args:
+            path: File to write
+            format: "json" for one document mapping metric names to their
+                measurements, or "jsonl" for one measurement per line,
+                streamed without building the whole document
+        """
+        if format == "jsonl":
+            _write_jsonl(path, self.metrics.iter_metrics())
+        elif format == "json":
+            _write_json(path, self.metrics.metrics)
+        else:
+            raise ValueError(f"Unknown export format: {format}")
     
-    def export_events(self, path: Path):
-        """Export all events to a file."""
-        data = [asdict(e) for e in self.events.events]
+    def export_events(self, path: Path, format: str = "json"):
+        """
+        Export all events to a file.
+        
+        Args:
+            path: File to write
+            format: "json" for one list of events, or "jsonl" for one event
+                per line
+        """
+        if format == "jsonl":
+            _write_jsonl(path, self.events.get_events())
+        elif format == "json":
+            _write_json(path, self.events.get_events())
+        else:
+            raise ValueError(f"Unknown export format: {format}")
+
+def _json_default(obj: Any) -> Any:
+    """Serialize dataclasses and other objects json can't handle."""
+    if is_dataclass(obj):
+        return asdict(obj)
+    if isinstance(obj, datetime):
+        # Match orjson's ISO 8601 output
+        return obj.isoformat()
+    return str(obj)
+
+def _write_json(path: Path, data: Any):
+    """
+    Write data, which may contain dataclasses, to a JSON file.
+    
+    orjson serializes dataclasses and datetimes in C when it is installed;
+    otherwise the standard library encoder is used.
+    """
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ))
+    else:
         with open(path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
\ No newline at end of file
+            json.dump(data, f, indent=2, default=_json_default)
+
+def _write_jsonl(path: Path, records: Iterable[Any]):
+    """Write records, which may be dataclasses, to a file one JSON object per line."""
+    with open(path, 'wb', buffering=1 << 20) as f:
+        for record in records:
+            if orjson is not None:
+                f.write(orjson.dumps(record, default=str))
+            else:
+                f.write(json.dumps(record, default=_json_default).encode())
+            f.write(b"\n")
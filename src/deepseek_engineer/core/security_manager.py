@@ -3,21 +3,195 @@
 import os
 import re
 from pathlib import Path
-from typing import List, Dict, Optional, Set, Pattern
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 from dataclasses import dataclass
 import json
-from datetime import datetime, timedelta
 import hashlib
+import math
+import heapq
 import secrets
+import threading
+import time
 from functools import wraps
 
-@dataclass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Rate-limit state is guarded by one of this many locks, chosen by
+# identifier, so checks for different identifiers rarely contend
+_RATE_LIMIT_SHARDS = 16
+
+# config file path -> (mtime_ns, size, parsed JSON)
+_CONFIG_CACHE: Dict[str, Tuple[int, int, Dict[str, Any]]] = {}
+
+def _read_config_file(path: Path) -> Dict[str, Any]:
+    """
+    Read a JSON config file.
+    
+    The parsed data is cached until the file's mtime or size changes, so
+    managers sharing a config file only parse it once. Callers must not
+    modify the returned dict.
+    """
+    st = path.stat()
+    key = str(path)
+    cached = _CONFIG_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+    
+    raw = path.read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    _CONFIG_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+_REGEX_METACHARS = frozenset(".^$*+?{}[]|()")
+
+def _pattern_literal(pattern: str) -> Optional[str]:
+    """Get the text a regex pattern matches if it is a plain literal, else None."""
+    chars = []
+    escaped = False
+    for ch in pattern:
+        if escaped:
+            if ch.isalnum():
+                # Class or reference such as \s or \1
+                return None
+            chars.append(ch)
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in _REGEX_METACHARS:
+            return None
+        else:
+            chars.append(ch)
+    return None if escaped else "".join(chars)
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Build a regex matching any of the words, with shared prefixes merged.
+    
+    Each alternation in the result starts with a distinct character, so the
+    regex engine follows one branch per position instead of trying every
+    word in turn.
+    """
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}  # End of a word
+    
+    def build(node: Dict[str, dict]) -> str:
+        alternatives = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alternatives:
+            return ""
+        if "" not in node and len(alternatives) == 1:
+            return alternatives[0]
+        group = "(?:" + "|".join(alternatives) + ")"
+        return group + "?" if "" in node else group
+    
+    return build(trie)
+
+class _PatternMatcher:
+    """Finds which of a set of regex patterns occurs in a text."""
+    
+    __slots__ = ("_literals", "_regexes", "_automaton", "_regex", "_bytes_regex")
+    
+    def __init__(self, patterns: List[str]):
+        """
+        Compile the patterns for searching.
+        
+        Args:
+            patterns: Regex patterns; plain literals among them are matched
+                together, with Aho-Corasick when pyahocorasick is installed
+                and as one trie-shaped alternative otherwise
+        """
+        self._literals: Dict[str, str] = {}  # literal text -> source pattern
+        self._regexes: List[str] = []
+        for pattern in patterns:
+            literal = _pattern_literal(pattern)
+            if literal:
+                self._literals[literal] = pattern
+            else:
+                self._regexes.append(pattern)
+        
+        self._automaton = None
+        # Name each regex's group so a match can be traced to its pattern
+        alternatives = [
+            f"(?P<p{i}>{pattern})" for i, pattern in enumerate(self._regexes)
+        ]
+        if self._literals:
+            literal_group = f"(?P<lit>{_trie_regex(list(self._literals))})"
+            if ahocorasick is not None:
+                self._automaton = ahocorasick.Automaton()
+                for literal, pattern in self._literals.items():
+                    self._automaton.add_word(literal, pattern)
+                self._automaton.make_automaton()
+                str_alternatives = alternatives
+            else:
+                str_alternatives = [literal_group] + alternatives
+            # The automaton only searches str, so bytes always use the trie
+            bytes_alternatives = [literal_group] + alternatives
+        else:
+            str_alternatives = bytes_alternatives = alternatives
+        
+        self._regex = (
+            re.compile("|".join(str_alternatives)) if str_alternatives else None
+        )
+        self._bytes_regex = (
+            re.compile("|".join(bytes_alternatives).encode('utf-8'))
+            if bytes_alternatives else None
+        )
+    
+    def search(self, text: Union[str, bytes]) -> Optional[str]:
+        """Get the source of a pattern occurring in text or bytes, or None."""
+        if not isinstance(text, str):
+            # Search bytes as they are rather than decoding them
+            if self._bytes_regex is not None:
+                match = self._bytes_regex.search(text)
+                if match:
+                    if match.lastgroup == "lit":
+                        return self._literals[bytes(match.group()).decode('utf-8')]
+                    return self._regexes[int(match.lastgroup[1:])]
+            return None
+        if self._automaton is not None:
+            found = next(self._automaton.iter(text), None)
+            if found is not None:
+                return found[1]
+        if self._regex is not None:
+            match = self._regex.search(text)
+            if match:
+                if match.lastgroup == "lit":
+                    return self._literals[match.group()]
+                return self._regexes[int(match.lastgroup[1:])]
+        return None
+
+def _path_prefixes(paths: Iterable[Path]) -> Tuple[str, ...]:
+    """Resolve directories into string prefixes matching only paths inside them."""
+    prefixes = []
+    for path in paths:
+        resolved = os.path.realpath(path)
+        prefixes.append(resolved if resolved.endswith(os.sep) else resolved + os.sep)
+    return tuple(prefixes)
+
+def _suffix(path: str) -> str:
+    """Get a path string's extension the way PurePath.suffix does."""
+    name = os.path.basename(path)
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
+
+@dataclass(frozen=True, slots=True)
 class SecurityConfig:
     """Security configuration settings."""
-    allowed_paths: List[Path]
-    blocked_paths: List[Path]
-    allowed_extensions: Set[str]
-    blocked_extensions: Set[str]
+    allowed_paths: Tuple[Path, ...]
+    blocked_paths: Tuple[Path, ...]
+    allowed_extensions: FrozenSet[str]
+    blocked_extensions: FrozenSet[str]
     max_file_size: int  # in bytes
     rate_limit_window: int  # in seconds
     rate_limit_max_requests: int
@@ -43,12 +217,46 @@ class InvalidInput(SecurityViolation):
 class SecurityManager:
     """Manages security and access control."""
     
-    def __init__(self, config_path: Optional[Path] = None):
-        """Initialize security manager with optional config path."""
+    def __init__(
+        self,
+        config_path: Optional[Path] = None,
+        time_fn: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize security manager.
+        
+        Args:
+            config_path: Optional path to a JSON config file
+            time_fn: Monotonic clock in seconds for rate limits and token expiry
+        """
         self.config = self._load_config(config_path)
-        self._rate_limit_tracker: Dict[str, List[datetime]] = {}
-        self._active_tokens: Dict[str, datetime] = {}
-        self._dangerous_patterns: List[Pattern] = self._compile_dangerous_patterns()
+        self._allowed_prefixes = _path_prefixes(self.config.allowed_paths)
+        self._blocked_prefixes = _path_prefixes(self.config.blocked_paths)
+        # Extensions passing both extension checks, or None when every
+        # extension that isn't blocked is allowed
+        self._permitted_extensions: Optional[FrozenSet[str]] = (
+            self.config.allowed_extensions - self.config.blocked_extensions
+            if self.config.allowed_extensions else None
+        )
+        self._now = time_fn
+        # GCRA: each request pushes an identifier's theoretical arrival time
+        # (TAT) one emission interval further; a request is rejected when
+        # its TAT would run more than the burst tolerance ahead of now
+        window = self.config.rate_limit_window
+        max_requests = self.config.rate_limit_max_requests
+        self._rate_limit_interval = window / max_requests if max_requests > 0 else math.inf
+        # A microsecond of slack absorbs rounding in the accumulated TAT
+        self._rate_limit_burst = window - self._rate_limit_interval + 1e-6
+        self._rate_limit_tat: Dict[str, float] = {}  # identifier -> TAT
+        self._rate_limit_locks = tuple(
+            threading.Lock() for _ in range(_RATE_LIMIT_SHARDS)
+        )
+        # token -> expiry time from the clock
+        self._active_tokens: Dict[str, float] = {}
+        # Min-heap of (expiry, token) so cleanup only visits expired tokens;
+        # entries of revoked tokens stay until they expire
+        self._token_expiries: List[Tuple[float, str]] = []
+        self._dangerous_patterns = self._compile_dangerous_patterns()
     
     def _load_config(self, config_path: Optional[Path]) -> SecurityConfig:
         """Load security configuration from file or use defaults."""
@@ -66,17 +274,15 @@ class SecurityManager:
         
         if config_path and config_path.exists():
             try:
-                with open(config_path, 'r') as f:
-                    custom_config = json.load(f)
-                defaults.update(custom_config)
+                defaults.update(_read_config_file(config_path))
             except Exception as e:
                 print(f"Warning: Failed to load security config: {e}")
         
         return SecurityConfig(
-            allowed_paths=[Path(p) for p in defaults["allowed_paths"]],
-            blocked_paths=[Path(p) for p in defaults["blocked_paths"]],
-            allowed_extensions=set(defaults["allowed_extensions"]),
-            blocked_extensions=set(defaults["blocked_extensions"]),
+            allowed_paths=tuple(Path(p) for p in defaults["allowed_paths"]),
+            blocked_paths=tuple(Path(p) for p in defaults["blocked_paths"]),
+            allowed_extensions=frozenset(defaults["allowed_extensions"]),
+            blocked_extensions=frozenset(defaults["blocked_extensions"]),
             max_file_size=defaults["max_file_size"],
             rate_limit_window=defaults["rate_limit_window"],
             rate_limit_max_requests=defaults["rate_limit_max_requests"],
@@ -84,8 +290,8 @@ class SecurityManager:
             auth_token_expiry=defaults["auth_token_expiry"]
         )
     
-    def _compile_dangerous_patterns(self) -> List[Pattern]:
-        """Compile regex patterns for dangerous content."""
+    def _compile_dangerous_patterns(self) -> _PatternMatcher:
+        """Compile regex patterns for dangerous content into one matcher."""
         patterns = [
             r"rm\s+-rf",  # Dangerous shell commands
             r"sudo",
@@ -98,14 +304,14 @@ class SecurityManager:
             r"input\(",  # Potential security risks
             r"open\([^)]*w",  # Write file operations
         ]
-        return [re.compile(pattern) for pattern in patterns]
+        return _PatternMatcher(patterns)
     
-    def validate_path(self, path: Path) -> bool:
+    def validate_path(self, path: Union[str, os.PathLike]) -> bool:
         """
         Validate if a path is allowed.
         
         Args:
-            path: Path to validate
+            path: Path to validate, as a string or path-like object
             
         Returns:
             bool: True if path is allowed
@@ -114,41 +320,49 @@ class SecurityManager:
             AccessDenied: If path access is not allowed
         """
         try:
-            resolved_path = path.resolve()
+            # Resolve symlinks so a link can't point outside allowed paths;
+            # the trailing separator keeps /etc from matching /etcetera
+            path = os.fspath(path)
+            resolved = os.path.realpath(path)
+            if not resolved.endswith(os.sep):
+                resolved += os.sep
             
-            # Check blocked paths
-            for blocked in self.config.blocked_paths:
-                if str(resolved_path).startswith(str(blocked)):
-                    raise AccessDenied(f"Access to path {path} is blocked")
+            suffix = _suffix(path)
+            permitted = self._permitted_extensions
+            if (
+                not resolved.startswith(self._blocked_prefixes)
+                and resolved.startswith(self._allowed_prefixes)
+                and (
+                    not suffix
+                    or (suffix in permitted if permitted is not None
+                        else suffix not in self.config.blocked_extensions)
+                )
+            ):
+                return True
             
-            # Check allowed paths
-            allowed = any(
-                str(resolved_path).startswith(str(allowed))
-                for allowed in self.config.allowed_paths
-            )
-            if not allowed:
-                raise AccessDenied(f"Path {path} is outside allowed directories")
-            
-            # Check extensions
-            if path.suffix:
-                if path.suffix in self.config.blocked_extensions:
-                    raise AccessDenied(f"File extension {path.suffix} is blocked")
-                if self.config.allowed_extensions and path.suffix not in self.config.allowed_extensions:
-                    raise AccessDenied(f"File extension {path.suffix} is not allowed")
-            
-            return True
+            raise AccessDenied(self._path_denial(path, resolved, suffix))
             
         except Exception as e:
             if not isinstance(e, AccessDenied):
                 raise AccessDenied(f"Path validation error: {str(e)}")
             raise
     
-    def validate_content(self, content: str) -> bool:
+    def _path_denial(self, path: str, resolved: str, suffix: str) -> str:
+        """Explain why validate_path rejected a path."""
+        if resolved.startswith(self._blocked_prefixes):
+            return f"Access to path {path} is blocked"
+        if not resolved.startswith(self._allowed_prefixes):
+            return f"Path {path} is outside allowed directories"
+        if suffix in self.config.blocked_extensions:
+            return f"File extension {suffix} is blocked"
+        return f"File extension {suffix} is not allowed"
+    
+    def validate_content(self, content: Union[str, bytes]) -> bool:
         """
         Validate if content is safe.
         
         Args:
-            content: Content to validate
+            content: Text, or bytes-like content validated without decoding
             
         Returns:
             bool: True if content is safe
@@ -156,14 +370,24 @@ class SecurityManager:
         Raises:
             InvalidInput: If content contains dangerous patterns
         """
-        # Check for dangerous patterns
-        for pattern in self._dangerous_patterns:
-            if pattern.search(content):
-                raise InvalidInput(f"Content contains dangerous pattern: {pattern.pattern}")
+        # Check content length first, since it rejects oversized content
+        # without scanning it. UTF-8 uses 1 to 4 bytes per character, so
+        # only lengths between those bounds need encoding to measure
+        max_size = self.config.max_file_size
+        if isinstance(content, str):
+            length = len(content)
+            too_large = length > max_size or (
+                4 * length > max_size and len(content.encode('utf-8')) > max_size
+            )
+        else:
+            too_large = memoryview(content).nbytes > max_size
+        if too_large:
+            raise InvalidInput(f"Content exceeds maximum size of {max_size} bytes")
         
-        # Check content length
-        if len(content.encode('utf-8')) > self.config.max_file_size:
-            raise InvalidInput(f"Content exceeds maximum size of {self.config.max_file_size} bytes")
+        # Check for dangerous patterns
+        pattern = self._dangerous_patterns.search(content)
+        if pattern is not None:
+            raise InvalidInput(f"Content contains dangerous pattern: {pattern}")
         
         return True
     
@@ -180,35 +404,29 @@ class SecurityManager:
         Raises:
             RateLimitExceeded: If rate limit is exceeded
         """
-        now = datetime.now()
-        window_start = now - timedelta(seconds=self.config.rate_limit_window)
-        
-        # Clean old requests
-        if identifier in self._rate_limit_tracker:
-            self._rate_limit_tracker[identifier] = [
-                t for t in self._rate_limit_tracker[identifier]
-                if t > window_start
-            ]
-        else:
-            self._rate_limit_tracker[identifier] = []
-        
-        # Check limit
-        if len(self._rate_limit_tracker[identifier]) >= self.config.rate_limit_max_requests:
-            raise RateLimitExceeded(
-                f"Rate limit of {self.config.rate_limit_max_requests} "
-                f"requests per {self.config.rate_limit_window} seconds exceeded"
-            )
-        
-        # Add new request
-        self._rate_limit_tracker[identifier].append(now)
+        tats = self._rate_limit_tat
+        with self._rate_limit_locks[hash(identifier) % _RATE_LIMIT_SHARDS]:
+            now = self._now()
+            tat = tats.get(identifier, now)
+            if tat < now:
+                tat = now
+            
+            # Check limit
+            if tat - now > self._rate_limit_burst:
+                raise RateLimitExceeded(
+                    f"Rate limit of {self.config.rate_limit_max_requests} "
+                    f"requests per {self.config.rate_limit_window} seconds exceeded"
+                )
+            
+            tats[identifier] = tat + self._rate_limit_interval
         return True
     
     def generate_auth_token(self) -> str:
         """Generate a new authentication token."""
         token = secrets.token_urlsafe(32)
-        self._active_tokens[token] = datetime.now() + timedelta(
-            seconds=self.config.auth_token_expiry
-        )
+        expiry = self._now() + self.config.auth_token_expiry
+        self._active_tokens[token] = expiry
+        heapq.heappush(self._token_expiries, (expiry, token))
         return token
     
     def validate_auth_token(self, token: str) -> bool:
@@ -226,11 +444,12 @@ class SecurityManager:
         """
         if not self.config.require_auth:
             return True
-            
-        if token not in self._active_tokens:
+        
+        expiry = self._active_tokens.get(token)
+        if expiry is None:
             raise AccessDenied("Invalid authentication token")
             
-        if datetime.now() > self._active_tokens[token]:
+        if self._now() > expiry:
             del self._active_tokens[token]
             raise AccessDenied("Authentication token expired")
             
@@ -238,45 +457,60 @@ class SecurityManager:
     
     def revoke_auth_token(self, token: str):
         """Revoke an authentication token."""
-        if token in self._active_tokens:
-            del self._active_tokens[token]
+        self._active_tokens.pop(token, None)
     
     def clean_expired_tokens(self):
         """Remove expired authentication tokens."""
-        now = datetime.now()
-        expired = [
-            token for token, expiry in self._active_tokens.items()
-            if now > expiry
-        ]
-        for token in expired:
-            del self._active_tokens[token]
+        now = self._now()
+        heap = self._token_expiries
+        while heap and heap[0][0] < now:
+            expiry, token = heapq.heappop(heap)
+            # Skip tokens already revoked or removed on validation
+            if self._active_tokens.get(token) == expiry:
+                del self._active_tokens[token]
     
     @staticmethod
-    def hash_content(content: str) -> str:
-        """Generate SHA-256 hash of content."""
-        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+    def hash_content(content: Union[str, bytes]) -> str:
+        """
+        Generate a 256-bit BLAKE2b hash of content for change detection.
+        
+        Args:
+            content: Text, encoded as UTF-8, or bytes hashed without copying
+            
+        Returns:
+            64 character hex digest
+        """
+        if isinstance(content, str):
+            content = content.encode('utf-8')
+        return hashlib.blake2b(content, digest_size=32).hexdigest()
     
     def require_auth(self, func):
         """Decorator to require authentication for a function."""
+        validate_auth_token = self.validate_auth_token
+        
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            token = kwargs.pop('auth_token', None)
-            self.validate_auth_token(token)
+        def wrapper(*args, auth_token: Optional[str] = None, **kwargs):
+            validate_auth_token(auth_token)
             return func(*args, **kwargs)
         return wrapper
     
     def secure_operation(self, func):
-        """Decorator to apply security checks to an operation."""
+        """
+        Decorator to apply security checks to an operation.
+        
+        The wrapper takes an optional identifier keyword for rate limiting,
+        which is not passed on to the function.
+        """
+        check_rate_limit = self.check_rate_limit
+        clean_expired_tokens = self.clean_expired_tokens
+        
         @wraps(func)
-        def wrapper(*args, **kwargs):
-            # Extract identifier for rate limiting (could be from kwargs)
-            identifier = kwargs.get('identifier', 'default')
-            
+        def wrapper(*args, identifier: str = 'default', **kwargs):
             # Perform security checks
-            self.check_rate_limit(identifier)
+            check_rate_limit(identifier)
             
             # Clean expired tokens periodically
-            self.clean_expired_tokens()
+            clean_expired_tokens()
             
             return func(*args, **kwargs)
-        return wrapper
\ No newline at end of file
+        return wrapper
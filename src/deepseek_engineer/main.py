@@ -4,8 +4,9 @@
 import os
 import sys
 import argparse
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import Mapping, Optional, Sequence
 import json
 
 from rich.console import Console
@@ -24,8 +25,13 @@ install_rich_traceback(show_locals=True)
 # Initialize Rich console
 console = Console()
 
+@functools.lru_cache(maxsize=1)
 def create_arg_parser() -> argparse.ArgumentParser:
-    """Create command line argument parser."""
+    """
+    Create command line argument parser.
+    
+    The parser is built once and shared; parse_args doesn't modify it.
+    """
     parser = argparse.ArgumentParser(
         description="DeepSeek Engineer - Advanced software development assistant"
     )
@@ -128,15 +134,28 @@ def handle_file_changes(changes: list):
     
     console.print(table)
 
-def main():
-    """Main CLI entry point."""
-    parser = create_arg_parser()
-    args = parser.parse_args()
-    
+def main(argv: Optional[Sequence[str]] = None):
+    """
+    Main CLI entry point.
+    
+    Args:
+        argv: Command line arguments, defaults to sys.argv[1:]
+    """
+    args = create_arg_parser().parse_args(argv)
+    run(args, os.environ)
+
+def run(args: argparse.Namespace, env: Mapping[str, str]):
+    """
+    Run the CLI with already-parsed arguments.
+    
+    Args:
+        args: Parsed command line arguments
+        env: Environment to read the API key from
+    """
     try:
         # Create configuration
         config = AppConfig(
-            api_key=args.api_key or os.getenv("DEEPSEEK_API_KEY"),
+            api_key=args.api_key or env.get("DEEPSEEK_API_KEY"),
             base_path=args.base_path or Path.cwd(),
             max_tokens=args.max_tokens,
             conversation_persist_path=args.conversation_path,
@@ -8,6 +8,8 @@ from .base import (
     PluginMetadata,
     PluginError,
     PluginInitError,
+    SCHEMA_ERRORS,
+    compile_schema,
     create_plugin_metadata
 )
 from .loader import PluginLoader, LoadedPlugin
@@ -29,6 +31,8 @@ __all__ = [
     'PluginMetadata',
     'PluginError',
     'PluginInitError',
+    'SCHEMA_ERRORS',
+    'compile_schema',
     'create_plugin_metadata',
     
     # Loader
@@ -1,13 +1,32 @@
 """Base classes and interfaces for MCP plugins."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List
+from typing import Callable, ClassVar, Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import json
 from pathlib import Path
 
-@dataclass
+from jsonschema.exceptions import SchemaError, ValidationError
+from jsonschema.validators import Draft202012Validator, validator_for
+
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_datetime
+except ImportError:
+    _parse_datetime = datetime.fromisoformat
+
+@dataclass(slots=True)
 class PluginMetadata:
     """Metadata for an MCP plugin."""
     name: str
@@ -52,8 +71,8 @@ class PluginMetadata:
             homepage=data.get("homepage"),
             repository=data.get("repository"),
             license=data.get("license", "MIT"),
-            created=datetime.fromisoformat(data["created"]) if "created" in data else None,
-            updated=datetime.fromisoformat(data["updated"]) if "updated" in data else None
+            created=_parse_datetime(data["created"]) if "created" in data else None,
+            updated=_parse_datetime(data["updated"]) if "updated" in data else None
         )
 
 class PluginError(Exception):
@@ -68,18 +87,81 @@ class PluginConfigError(PluginError):
     """Raised when plugin configuration is invalid."""
     pass
 
+# Errors raised by the validators compile_schema returns
+if fastjsonschema is not None:
+    SCHEMA_ERRORS: Tuple[type, ...] = (fastjsonschema.JsonSchemaValueException, ValidationError)
+    _SCHEMA_DEFINITION_ERRORS: Tuple[type, ...] = (
+        fastjsonschema.JsonSchemaDefinitionException,
+        SchemaError
+    )
+else:
+    SCHEMA_ERRORS = (ValidationError,)
+    _SCHEMA_DEFINITION_ERRORS = (SchemaError,)
+
+# Drafts fastjsonschema implements, as given by a schema's $schema
+_FASTJSONSCHEMA_DRAFTS = frozenset(
+    f"http://json-schema.org/draft-{version}/schema" for version in ("04", "06", "07")
+)
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], Any]:
+    """
+    Build a validation function for a JSON schema.
+    
+    Schemas are validated against the draft named by their $schema, and
+    against draft 2020-12 when it is absent. fastjsonschema generates
+    straight-line Python for the drafts it implements (4, 6 and 7) when it
+    is installed; other schemas get a jsonschema validator built once.
+    
+    Args:
+        schema: JSON schema
+        
+    Returns:
+        Function raising one of SCHEMA_ERRORS for an invalid instance
+        
+    Raises:
+        PluginError: If the schema itself is invalid
+    """
+    draft = schema.get("$schema", "").rstrip("#")
+    try:
+        if fastjsonschema is not None and draft in _FASTJSONSCHEMA_DRAFTS:
+            return fastjsonschema.compile(schema)
+        validator_cls = validator_for(schema, default=Draft202012Validator)
+        validator_cls.check_schema(schema)
+        return validator_cls(schema).validate
+    except _SCHEMA_DEFINITION_ERRORS as e:
+        raise PluginError(f"Invalid JSON schema: {str(e)}")
+
 class MCPPlugin(ABC):
     """Abstract base class for MCP plugins."""
     
+    # JSON schema for the plugin configuration; when set, configurations are
+    # checked against it before _validate_config runs
+    config_schema: ClassVar[Optional[Dict[str, Any]]] = None
+    
     def __init__(self, metadata: PluginMetadata, config: Optional[Dict[str, Any]] = None):
         """Initialize plugin with metadata and optional configuration."""
         self.metadata = metadata
         self.config = config or {}
+        if self.config_schema is not None:
+            try:
+                self._get_config_validator()(self.config)
+            except SCHEMA_ERRORS as e:
+                raise PluginConfigError(f"Invalid configuration: {str(e)}")
         self._validate_config()
     
-    @abstractmethod
+    @classmethod
+    def _get_config_validator(cls) -> Callable[[Any], Any]:
+        """Get the validator for config_schema, compiled once per class."""
+        cached: Optional[Tuple[Dict[str, Any], Callable[[Any], Any]]] = (
+            cls.__dict__.get("_config_validator")
+        )
+        if cached is None or cached[0] is not cls.config_schema:
+            cached = (cls.config_schema, compile_schema(cls.config_schema))
+            cls._config_validator = cached
+        return cached[1]
+    
     def _validate_config(self):
-        """Validate plugin configuration."""
+        """Validate plugin configuration beyond what config_schema checks."""
         pass
     
     @abstractmethod
@@ -105,6 +187,21 @@ class ResourceProvider(MCPPlugin):
         """Get resource by URI."""
         pass
     
+    async def get_resources_bulk(self, uris: List[str]) -> List[Any]:
+        """
+        Get several resources in one call.
+        
+        The default fetches each URI through get_resource concurrently;
+        providers backed by a batch API should override it.
+        
+        Args:
+            uris: Resource URIs
+            
+        Returns:
+            Resources in the same order as uris
+        """
+        return list(await asyncio.gather(*(self.get_resource(uri) for uri in uris)))
+    
     @abstractmethod
     def list_resources(self) -> List[Dict[str, Any]]:
         """List available resources."""
@@ -140,8 +237,8 @@ class HybridPlugin(ResourceProvider, ToolProvider):
 def load_plugin_metadata(path: Path) -> PluginMetadata:
     """Load plugin metadata from a file."""
     try:
-        with open(path / "plugin.json") as f:
-            data = json.load(f)
+        raw = (path / "plugin.json").read_bytes()
+        data = orjson.loads(raw) if orjson is not None else json.loads(raw)
         return PluginMetadata.from_dict(data)
     except Exception as e:
         raise PluginError(f"Failed to load plugin metadata: {str(e)}")
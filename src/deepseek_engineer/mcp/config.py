@@ -2,17 +2,31 @@
 
 import os
 import json
-from typing import Dict, Any, Optional, List, Union
+import secrets
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Mapping, Tuple, Union
 from pathlib import Path
+from types import MappingProxyType
 from dataclasses import dataclass, asdict
-import jsonschema
-from jsonschema import validate, ValidationError
+from jsonschema.exceptions import ValidationError
+from jsonschema.validators import Draft202012Validator
 import yaml
 import logging
 from copy import deepcopy
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# libyaml's loader parses straight from the file stream in C; fall back to
+# the pure-Python loader when PyYAML was built without it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
 @dataclass
 class PluginConfigSchema:
     """Schema for plugin configuration."""
@@ -72,6 +86,9 @@ class ConfigurationManager:
         
         self._schemas: Dict[str, PluginConfigSchema] = {}
         self._configs: Dict[str, Dict[str, Any]] = {}
+        self._env_paths: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._validators: Dict[str, Draft202012Validator] = {}  # Per registered schema
+        self._saved: Dict[str, bytes] = {}  # Last data written per plugin
         self._env_prefix = "DEEPSEEK_PLUGIN_"
     
     def register_schema(self, plugin_name: str, schema: PluginConfigSchema):
@@ -81,8 +98,27 @@ class ConfigurationManager:
         Args:
             plugin_name: Name of the plugin
             schema: Configuration schema
+            
+        Raises:
+            SchemaError: If the schema itself is invalid
         """
+        # Check the schema and build its validator once here rather than
+        # on every validation; plugins sharing a schema share the validator
+        validator = next(
+            (
+                self._validators[name]
+                for name, registered in self._schemas.items()
+                if registered is schema and name != plugin_name
+            ),
+            None
+        )
+        if validator is None:
+            schema_dict = schema.to_dict()
+            Draft202012Validator.check_schema(schema_dict)
+            validator = Draft202012Validator(schema_dict)
         self._schemas[plugin_name] = schema
+        self._validators[plugin_name] = validator
+        self._env_paths[plugin_name] = self._build_env_paths(schema.properties)
         
         # Load existing configuration if available
         self.load_config(plugin_name)
@@ -98,22 +134,58 @@ class ConfigurationManager:
         Raises:
             ConfigValidationError: If configuration is invalid
         """
+        self._validate_config(plugin_name, config)
+        self._configs[plugin_name] = deepcopy(config)
+        
+        # Save configuration
+        self.save_config(plugin_name)
+    
+    def set_configs(self, configs: Dict[str, Dict[str, Any]]):
+        """
+        Set and validate configurations for several plugins at once.
+        
+        All configurations are validated before any is stored, so an invalid
+        entry leaves every plugin's configuration unchanged. Files are then
+        written concurrently.
+        
+        Args:
+            configs: Dict mapping plugin names to configuration data
+            
+        Raises:
+            ConfigValidationError: If any configuration is invalid
+        """
+        for plugin_name, config in configs.items():
+            self._validate_config(plugin_name, config)
+        
+        for plugin_name, config in configs.items():
+            self._configs[plugin_name] = deepcopy(config)
+        
+        with ThreadPoolExecutor() as executor:
+            list(executor.map(self.save_config, configs))
+    
+    def _validate_config(self, plugin_name: str, config: Dict[str, Any]):
+        """
+        Validate configuration against a plugin's registered schema.
+        
+        Args:
+            plugin_name: Name of the plugin
+            config: Configuration data
+            
+        Raises:
+            ConfigError: If no schema is registered for the plugin
+            ConfigValidationError: If configuration is invalid
+        """
         if plugin_name not in self._schemas:
             raise ConfigError(f"No schema registered for plugin {plugin_name}")
         
-        # Validate configuration
         try:
-            validate(
-                instance=config,
-                schema=self._schemas[plugin_name].to_dict()
-            )
+            self._get_validator(plugin_name).validate(config)
         except ValidationError as e:
             raise ConfigValidationError(f"Invalid configuration: {str(e)}")
-        
-        self._configs[plugin_name] = deepcopy(config)
-        
-        # Save configuration
-        self.save_config(plugin_name)
+    
+    def _get_validator(self, plugin_name: str) -> Draft202012Validator:
+        """Get the validator built for a plugin's registered schema."""
+        return self._validators[plugin_name]
     
     def get_config(self, plugin_name: str) -> Dict[str, Any]:
         """
@@ -129,6 +201,23 @@ class ConfigurationManager:
             self.load_config(plugin_name)
         return deepcopy(self._configs.get(plugin_name, {}))
     
+    def get_config_view(self, plugin_name: str) -> Mapping[str, Any]:
+        """
+        Get a read-only view of a plugin's configuration without copying it.
+        
+        The view is shallow: nested values are shared with the stored
+        configuration and must not be mutated. Use get_config for a copy.
+        
+        Args:
+            plugin_name: Name of the plugin
+            
+        Returns:
+            Read-only plugin configuration
+        """
+        if plugin_name not in self._configs:
+            self.load_config(plugin_name)
+        return MappingProxyType(self._configs.get(plugin_name, {}))
+    
     def load_config(self, plugin_name: str):
         """
         Load configuration from file and environment.
@@ -144,7 +233,7 @@ class ConfigurationManager:
             try:
                 if config_file.suffix == '.yaml':
                     with open(config_file) as f:
-                        config = yaml.safe_load(f)
+                        config = yaml.load(f, Loader=_YamlLoader)
                 else:
                     with open(config_file) as f:
                         config = json.load(f)
@@ -157,34 +246,71 @@ class ConfigurationManager:
         # Validate if schema exists
         if plugin_name in self._schemas:
             try:
-                validate(
-                    instance=config,
-                    schema=self._schemas[plugin_name].to_dict()
-                )
+                self._get_validator(plugin_name).validate(config)
             except ValidationError as e:
                 logger.error(f"Invalid configuration for {plugin_name}: {str(e)}")
                 config = {}
         
         self._configs[plugin_name] = config
     
-    def save_config(self, plugin_name: str):
+    def save_config(self, plugin_name: str, durable: bool = False):
         """
         Save configuration to file.
         
+        The file is replaced atomically, and the write is skipped when the
+        data matches what was last saved.
+        
         Args:
             plugin_name: Name of the plugin
+            durable: Whether to fsync the file before replacing the old one
         """
         if plugin_name not in self._configs:
             return
             
         config_file = self._get_config_path(plugin_name)
+        config = self._configs[plugin_name]
         try:
+            # Serialize to a single buffer and write it in one call
             if config_file.suffix == '.yaml':
-                with open(config_file, 'w') as f:
-                    yaml.safe_dump(self._configs[plugin_name], f)
+                data = yaml.dump(config, Dumper=_YamlDumper).encode('utf-8')
+            elif orjson is not None:
+                data = orjson.dumps(
+                    config,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
             else:
-                with open(config_file, 'w') as f:
-                    json.dump(self._configs[plugin_name], f, indent=2)
+                data = json.dumps(config, indent=2).encode('utf-8')
+            
+            if self._saved.get(plugin_name) == data and config_file.exists():
+                return
+            
+            # Keep the permissions of the file being replaced; a new file
+            # gets the umask default, applied by the kernel on creation
+            try:
+                mode = stat.S_IMODE(os.stat(config_file).st_mode)
+            except FileNotFoundError:
+                mode = None
+            
+            tmp_path = self.config_dir / f"{config_file.name}.{secrets.token_hex(8)}.tmp"
+            fd = os.open(
+                tmp_path,
+                os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                0o666
+            )
+            try:
+                with open(fd, "wb") as f:
+                    f.write(data)
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                if mode is not None:
+                    os.chmod(tmp_path, mode)
+                os.replace(tmp_path, config_file)
+            except BaseException:
+                # Don't leave the temporary file behind in config_dir
+                os.unlink(tmp_path)
+                raise
+            self._saved[plugin_name] = data
         except Exception as e:
             logger.error(f"Error saving config for {plugin_name}: {str(e)}")
     
@@ -208,19 +334,19 @@ class ConfigurationManager:
             Updated configuration
         """
         prefix = f"{self._env_prefix}{plugin_name.upper()}_"
+        env_paths = self._env_paths.get(plugin_name, {})
         result = deepcopy(config)
         
         for key, value in os.environ.items():
             if key.startswith(prefix):
                 config_key = key[len(prefix):].lower()
                 
-                # Handle nested keys (e.g., PLUGIN_DB_HOST -> db.host)
-                parts = config_key.split('_')
+                # Handle nested keys (e.g., PLUGIN_DB_HOST -> db.host), using
+                # the schema's paths when known
+                parts = env_paths.get(config_key) or config_key.split('_')
                 current = result
                 for part in parts[:-1]:
-                    if part not in current:
-                        current[part] = {}
-                    current = current[part]
+                    current = current.setdefault(part, {})
                 
                 # Try to parse as JSON, fallback to string
                 try:
@@ -230,6 +356,32 @@ class ConfigurationManager:
         
         return result
     
+    def _build_env_paths(
+        self,
+        properties: Dict[str, Dict[str, Any]],
+        parent: Tuple[str, ...] = ()
+    ) -> Dict[str, Tuple[str, ...]]:
+        """
+        Map environment variable suffixes to nested configuration paths.
+        
+        Args:
+            properties: Schema properties to walk
+            parent: Path of the enclosing property
+            
+        Returns:
+            Dict mapping lowercase env suffixes (e.g. db_host) to key paths
+        """
+        paths: Dict[str, Tuple[str, ...]] = {}
+        for name, prop in properties.items():
+            path = parent + (name,)
+            paths.setdefault("_".join(path).lower(), path)
+            if isinstance(prop, dict) and "properties" in prop:
+                for suffix, sub_path in self._build_env_paths(
+                    prop["properties"], path
+                ).items():
+                    paths.setdefault(suffix, sub_path)
+        return paths
+    
     def get_schema(self, plugin_name: str) -> Optional[PluginConfigSchema]:
         """Get configuration schema for a plugin."""
         return self._schemas.get(plugin_name)
@@ -242,6 +394,7 @@ class ConfigurationManager:
         """Clear configuration for a plugin."""
         if plugin_name in self._configs:
             del self._configs[plugin_name]
+        self._saved.pop(plugin_name, None)
             
         config_file = self._get_config_path(plugin_name)
         if config_file.exists():
@@ -250,5 +403,6 @@ class ConfigurationManager:
     def clear_all_configs(self):
         """Clear all plugin configurations."""
         self._configs.clear()
+        self._saved.clear()
         for config_file in self.config_dir.glob("*.yaml"):
             config_file.unlink()
\ No newline at end of file
@@ -4,10 +4,11 @@ import os
 import sys
 import importlib.util
 import inspect
-from typing import Dict, List, Type, Optional, Set
+from typing import AbstractSet, Dict, FrozenSet, Iterable, List, Mapping, Type, Optional, Set, Tuple
 from pathlib import Path
 import asyncio
 import logging
+from collections import deque
 from dataclasses import dataclass
 
 from .base import (
@@ -20,22 +21,69 @@ from .base import (
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+def dependency_levels(deps: Mapping[str, AbstractSet[str]]) -> List[List[str]]:
+    """
+    Group plugins into levels by their dependencies.
+    
+    Dependencies on names missing from deps are ignored. Plugins caught in
+    a dependency cycle each get a level of their own at the end, so callers
+    handle them one at a time and can report the cycle.
+    
+    Args:
+        deps: Dict mapping plugin names to the names they depend on
+        
+    Returns:
+        Plugin names in levels; each level only depends on earlier ones
+    """
+    levels = []
+    done: Set[str] = set()
+    remaining = {name: set(names) & deps.keys() for name, names in deps.items()}
+    while remaining:
+        ready = [name for name, names in remaining.items() if names <= done]
+        if not ready:
+            levels.extend([name] for name in remaining)
+            break
+        for name in ready:
+            del remaining[name]
+        levels.append(ready)
+        done.update(ready)
+    return levels
+
+@dataclass(frozen=True, slots=True, eq=False)
 class LoadedPlugin:
-    """Information about a loaded plugin."""
+    """
+    Immutable information about a loaded plugin, hashed by identity.
+    
+    Lazily loaded plugins have no instance; PluginLoader.create_instance
+    creates one when the plugin is first used.
+    """
     metadata: PluginMetadata
-    instance: MCPPlugin
+    instance: Optional[MCPPlugin]
     path: Path
-    dependencies: Set[str]
+    dependencies: FrozenSet[str]
 
 class PluginLoader:
     """Handles plugin discovery, loading, and lifecycle management."""
     
-    def __init__(self, plugin_dirs: Optional[List[Path]] = None):
-        """Initialize plugin loader with optional plugin directories."""
+    def __init__(self, plugin_dirs: Optional[List[Path]] = None, lazy: bool = False):
+        """
+        Initialize plugin loader.
+        
+        Args:
+            plugin_dirs: Optional plugin directories
+            lazy: Only read plugin metadata on load and defer importing the
+                plugin module until the instance is first needed
+        """
         self.plugin_dirs = plugin_dirs or []
+        self.lazy = lazy
+        self._lazy_configs: Dict[str, Optional[Dict]] = {}  # Configs of lazy plugins
         self.loaded_plugins: Dict[str, LoadedPlugin] = {}
         self._loading: Set[str] = set()  # For circular dependency detection
+        self._load_locks: Dict[str, asyncio.Lock] = {}  # Prevent duplicate loads
+        # module file -> (mtime_ns, size, plugin class)
+        self._class_cache: Dict[str, Tuple[int, int, Type[MCPPlugin]]] = {}
+        # plugin dir -> (mtime_ns, size, metadata) of its plugin.json
+        self._metadata_cache: Dict[str, Tuple[int, int, PluginMetadata]] = {}
     
     def add_plugin_dir(self, path: Path):
         """Add a directory to search for plugins."""
@@ -55,11 +103,12 @@ class PluginLoader:
             if not plugin_dir.exists():
                 logger.warning(f"Plugin directory does not exist: {plugin_dir}")
                 continue
-                
-            # Look for plugin.json files
-            for path in plugin_dir.glob("*/plugin.json"):
-                plugin_path = path.parent
-                discovered.append(plugin_path)
+            
+            # Look for subdirectories containing a plugin.json file
+            with os.scandir(plugin_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir() and os.path.isfile(os.path.join(entry.path, "plugin.json")):
+                        discovered.append(Path(entry.path))
                 
         return discovered
     
@@ -84,6 +133,15 @@ class PluginLoader:
         if not module_file:
             raise PluginError(f"No plugin module found in {path}")
         
+        # A module this loader already executed yields the same class until
+        # its mtime or size changes, so reloads of unchanged plugins skip
+        # the import
+        key = str(module_file)
+        st = module_file.stat()
+        cached = self._class_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
         try:
             # Import module
             module_name = f"mcp_plugin_{path.name}"
@@ -100,6 +158,7 @@ class PluginLoader:
                 if (inspect.isclass(item) and 
                     issubclass(item, MCPPlugin) and 
                     item != MCPPlugin):
+                    self._class_cache[key] = (st.st_mtime_ns, st.st_size, item)
                     return item
             
             raise PluginError(f"No plugin class found in {module_file}")
@@ -107,11 +166,40 @@ class PluginLoader:
         except Exception as e:
             raise PluginError(f"Failed to load plugin module: {str(e)}")
     
+    def _get_metadata(self, path: Path) -> PluginMetadata:
+        """
+        Get the metadata of a plugin directory.
+        
+        Parsed metadata is cached until plugin.json's mtime or size changes,
+        so repeated discovery and load cycles only stat the file.
+        
+        Args:
+            path: Path to plugin directory
+            
+        Returns:
+            Plugin metadata
+        """
+        key = str(path)
+        try:
+            st = os.stat(path / "plugin.json")
+        except OSError:
+            # Let load_plugin_metadata report the missing file
+            return load_plugin_metadata(path)
+        
+        cached = self._metadata_cache.get(key)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        metadata = load_plugin_metadata(path)
+        self._metadata_cache[key] = (st.st_mtime_ns, st.st_size, metadata)
+        return metadata
+    
     async def load_plugin(
         self,
         path: Path,
         config: Optional[Dict] = None,
-        _loading_chain: Optional[Set[str]] = None
+        _loading_chain: Optional[Set[str]] = None,
+        metadata: Optional[PluginMetadata] = None
     ) -> LoadedPlugin:
         """
         Load a plugin from a directory.
@@ -120,6 +208,8 @@ class PluginLoader:
             path: Path to plugin directory
             config: Optional plugin configuration
             _loading_chain: Internal set for circular dependency detection
+            metadata: Optional pre-parsed plugin metadata, read from
+                plugin.json if not given
             
         Returns:
             LoadedPlugin instance
@@ -129,7 +219,8 @@ class PluginLoader:
         """
         try:
             # Load metadata
-            metadata = load_plugin_metadata(path)
+            if metadata is None:
+                metadata = self._get_metadata(path)
             
             # Check for circular dependencies
             if _loading_chain is None:
@@ -141,56 +232,105 @@ class PluginLoader:
                     f"Circular dependency detected: {chain} -> {metadata.name}"
                 )
             
-            # Check if already loaded
-            if metadata.name in self.loaded_plugins:
-                return self.loaded_plugins[metadata.name]
-            
-            # Track loading state
-            _loading_chain.add(metadata.name)
-            
-            # Load dependencies first
-            dependencies = set()
-            if config and "dependencies" in config:
-                for dep_name, dep_config in config["dependencies"].items():
-                    dep_path = Path(dep_config["path"])
-                    dep_plugin = await self.load_plugin(
-                        dep_path,
-                        dep_config.get("config"),
-                        _loading_chain
+            # Serialize loads of the same plugin so concurrent callers
+            # (e.g. shared dependencies) don't instantiate it twice
+            lock = self._load_locks.setdefault(metadata.name, asyncio.Lock())
+            async with lock:
+                # Check if already loaded
+                if metadata.name in self.loaded_plugins:
+                    return self.loaded_plugins[metadata.name]
+                
+                # Track loading state
+                _loading_chain.add(metadata.name)
+                
+                # Load dependencies first
+                dependencies = set()
+                if config and "dependencies" in config:
+                    for dep_name, dep_config in config["dependencies"].items():
+                        dep_path = Path(dep_config["path"])
+                        dep_plugin = await self.load_plugin(
+                            dep_path,
+                            dep_config.get("config"),
+                            _loading_chain
+                        )
+                        dependencies.add(dep_name)
+                
+                if self.lazy:
+                    # Defer the module import; the registry initializes the
+                    # plugin once it is first used
+                    loaded = LoadedPlugin(
+                        metadata=metadata,
+                        instance=None,
+                        path=path,
+                        dependencies=frozenset(dependencies)
                     )
-                    dependencies.add(dep_name)
-            
-            # Load plugin class
-            plugin_class = self._load_plugin_module(path)
-            if not plugin_class:
-                raise PluginError(f"No plugin class found in {path}")
-            
-            # Instantiate plugin
-            plugin = plugin_class(metadata, config)
-            
-            # Initialize plugin
-            try:
-                await plugin.initialize()
-            except Exception as e:
-                raise PluginInitError(f"Plugin initialization failed: {str(e)}")
-            
-            # Register loaded plugin
-            loaded = LoadedPlugin(
-                metadata=metadata,
-                instance=plugin,
-                path=path,
-                dependencies=dependencies
-            )
-            self.loaded_plugins[metadata.name] = loaded
-            
-            # Remove from loading chain
-            _loading_chain.remove(metadata.name)
-            
-            return loaded
-            
+                    self._lazy_configs[metadata.name] = config
+                else:
+                    plugin = await self._create_plugin(path, metadata, config)
+                    
+                    # Initialize plugin
+                    try:
+                        await plugin.initialize()
+                    except Exception as e:
+                        raise PluginInitError(f"Plugin initialization failed: {str(e)}")
+                    
+                    loaded = LoadedPlugin(
+                        metadata=metadata,
+                        instance=plugin,
+                        path=path,
+                        dependencies=frozenset(dependencies)
+                    )
+                
+                # Register loaded plugin
+                self.loaded_plugins[metadata.name] = loaded
+                
+                # Remove from loading chain
+                _loading_chain.remove(metadata.name)
+                
+                return loaded
+                
         except Exception as e:
             raise PluginError(f"Failed to load plugin from {path}: {str(e)}")
     
+    async def _create_plugin(
+        self,
+        path: Path,
+        metadata: PluginMetadata,
+        config: Optional[Dict]
+    ) -> MCPPlugin:
+        """
+        Import a plugin module and instantiate its plugin class.
+        
+        The module is imported off the event loop so a slow import doesn't
+        stall other plugins loading concurrently; the plugin itself is
+        constructed on the loop.
+        
+        Args:
+            path: Path to plugin directory
+            metadata: Plugin metadata
+            config: Optional plugin configuration
+            
+        Returns:
+            Uninitialized plugin instance
+        """
+        plugin_class = await asyncio.to_thread(self._load_plugin_module, path)
+        if not plugin_class:
+            raise PluginError(f"No plugin class found in {path}")
+        return plugin_class(metadata, config)
+    
+    async def create_instance(self, loaded: LoadedPlugin) -> MCPPlugin:
+        """
+        Create the instance of a lazily loaded plugin.
+        
+        Args:
+            loaded: Lazily loaded plugin
+            
+        Returns:
+            Uninitialized plugin instance
+        """
+        config = self._lazy_configs.get(loaded.metadata.name)
+        return await self._create_plugin(loaded.path, loaded.metadata, config)
+    
     async def load_all_plugins(self, configs: Optional[Dict[str, Dict]] = None):
         """
         Discover and load all plugins.
@@ -200,13 +340,35 @@ class PluginLoader:
         """
         discovered = self.discover_plugins()
         
+        entries: Dict[str, Tuple[Path, PluginMetadata, Optional[Dict]]] = {}
         for path in discovered:
             try:
-                metadata = load_plugin_metadata(path)
+                metadata = self._get_metadata(path)
+            except Exception as e:
+                logger.error(f"Failed to load plugin {path}: {str(e)}")
+                continue
+            if metadata.name not in entries:
                 config = configs.get(metadata.name) if configs else None
-                await self.load_plugin(path, config)
+                entries[metadata.name] = (path, metadata, config)
+        
+        async def load_one(
+            path: Path,
+            metadata: PluginMetadata,
+            config: Optional[Dict]
+        ):
+            try:
+                await self.load_plugin(path, config, metadata=metadata)
             except Exception as e:
                 logger.error(f"Failed to load plugin {path}: {str(e)}")
+        
+        # Plugins within a level don't depend on each other, so they can
+        # be loaded concurrently
+        deps = {
+            name: set((config or {}).get("dependencies", {}))
+            for name, (_, _, config) in entries.items()
+        }
+        for level in dependency_levels(deps):
+            await asyncio.gather(*(load_one(*entries[name]) for name in level))
     
     def get_plugin(self, name: str) -> Optional[LoadedPlugin]:
         """Get a loaded plugin by name."""
@@ -216,39 +378,94 @@ class PluginLoader:
         """Get metadata for all loaded plugins."""
         return [p.metadata for p in self.loaded_plugins.values()]
     
-    async def unload_plugin(self, name: str):
+    def get_plugin_config(self, name: str) -> Optional[Dict]:
+        """Get the configuration a loaded plugin was created with."""
+        plugin = self.loaded_plugins[name]
+        if plugin.instance is not None:
+            return plugin.instance.config
+        return self._lazy_configs.get(name)
+    
+    def get_dependents(self, name: str) -> List[str]:
         """
-        Unload a plugin and its dependencies.
+        Get loaded plugins that depend on a plugin, directly or transitively.
         
         Args:
-            name: Name of plugin to unload
-        """
-        if name not in self.loaded_plugins:
-            return
+            name: Name of the plugin
             
-        plugin = self.loaded_plugins[name]
+        Returns:
+            Dependent plugin names, ordered so dependents come before their
+            dependencies
+        """
+        return [p_name for p_name in self._unload_order([name]) if p_name != name]
+    
+    def _unload_order(self, names: Iterable[str]) -> List[str]:
+        """
+        Order plugins and all plugins depending on them for unloading.
         
-        # Unload plugins that depend on this one
-        dependents = [
-            p_name for p_name, p in self.loaded_plugins.items()
-            if name in p.dependencies
-        ]
+        Args:
+            names: Names of plugins to unload
+            
+        Returns:
+            Plugin names with dependents ordered before their dependencies
+        """
+        dependents: Dict[str, List[str]] = {}
+        for p_name, p in self.loaded_plugins.items():
+            for dep in p.dependencies:
+                dependents.setdefault(dep, []).append(p_name)
         
-        for dep in dependents:
-            await self.unload_plugin(dep)
+        # Collect the plugins and everything that transitively depends on them
+        closure: Set[str] = set()
+        queue = deque(name for name in names if name in self.loaded_plugins)
+        while queue:
+            name = queue.popleft()
+            if name not in closure:
+                closure.add(name)
+                queue.extend(dependents.get(name, ()))
         
-        # Shutdown plugin
+        # A plugin is ready to unload once none of its dependents remain
+        remaining = {name: len(dependents.get(name, ())) for name in closure}
+        ready = deque(
+            name for name in reversed(self.loaded_plugins)
+            if remaining.get(name) == 0
+        )
+        order = []
+        while ready:
+            name = ready.popleft()
+            order.append(name)
+            for dep in self.loaded_plugins[name].dependencies:
+                if dep in remaining:
+                    remaining[dep] -= 1
+                    if remaining[dep] == 0:
+                        ready.append(dep)
+        return order
+    
+    async def _shutdown_plugin(self, name: str):
+        """Shutdown a single plugin and remove it from loaded plugins."""
+        plugin = self.loaded_plugins.pop(name)
+        self._lazy_configs.pop(name, None)
+        if plugin.instance is None:
+            # Lazily loaded and never used, so nothing is running
+            return
         try:
             await plugin.instance.shutdown()
         except Exception as e:
             logger.error(f"Error shutting down plugin {name}: {str(e)}")
+    
+    async def unload_plugin(self, name: str):
+        """
+        Unload a plugin and its dependents.
         
-        # Remove from loaded plugins
-        del self.loaded_plugins[name]
+        Args:
+            name: Name of plugin to unload
+        """
+        for plugin_name in self._unload_order([name]):
+            await self._shutdown_plugin(plugin_name)
     
     async def reload_plugin(self, name: str):
         """
-        Reload a plugin and its dependents.
+        Reload a plugin.
+        
+        Its dependents are unloaded with it and are not loaded again.
         
         Args:
             name: Name of plugin to reload
@@ -256,12 +473,12 @@ class PluginLoader:
         if name not in self.loaded_plugins:
             raise PluginError(f"Plugin {name} not loaded")
             
-        plugin = self.loaded_plugins[name]
-        path = plugin.path
-        config = plugin.instance.config
+        path = self.loaded_plugins[name].path
+        config = self.get_plugin_config(name)
         
         # Unload plugin and dependents
         await self.unload_plugin(name)
+        self._metadata_cache.pop(str(path), None)
         
         # Reload plugin
         await self.load_plugin(path, config)
@@ -269,6 +486,5 @@ class PluginLoader:
     async def shutdown(self):
         """Shutdown all plugins."""
         # Shutdown in reverse dependency order
-        plugin_names = list(self.loaded_plugins.keys())
-        for name in reversed(plugin_names):
-            await self.unload_plugin(name)
\ No newline at end of file
+        for name in self._unload_order(list(self.loaded_plugins)):
+            await self._shutdown_plugin(name)
\ No newline at end of file
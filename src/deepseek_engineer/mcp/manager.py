@@ -1,7 +1,7 @@
 """MCP manager for coordinating plugin system components."""
 
 import asyncio
-from typing import Dict, List, Any, Optional, Set, Callable
+from typing import Dict, List, Any, Mapping, Optional, Set, Callable
 from pathlib import Path
 import logging
 from datetime import datetime
@@ -36,6 +36,7 @@ class MCPManager:
         """
         self.registry = PluginRegistry()
         self.config_manager = ConfigurationManager(config_dir)
+        self._shutdown_done = False
         
         # Add plugin directories
         if plugin_dirs:
@@ -51,6 +52,7 @@ class MCPManager:
         try:
             # Discover and load plugins
             await self.registry.discover_and_load()
+            self._shutdown_done = False
             
             logger.info(
                 f"Initialized {len(self.registry.get_active_plugins())} plugins"
@@ -61,9 +63,17 @@ class MCPManager:
             raise
     
     async def shutdown(self):
-        """Shutdown plugin system and cleanup."""
+        """
+        Shutdown plugin system and cleanup.
+        
+        Calling shutdown again before the next initialize is a no-op.
+        """
+        if self._shutdown_done:
+            return
+        
         try:
             await self.registry.shutdown()
+            self._shutdown_done = True
             logger.info("Plugin system shutdown complete")
             
         except Exception as e:
@@ -94,6 +104,15 @@ class MCPManager:
         """
         self.config_manager.set_config(plugin_name, config)
     
+    def configure_plugins(self, configs: Dict[str, Dict[str, Any]]):
+        """
+        Configure several plugins at once.
+        
+        Args:
+            configs: Dict mapping plugin names to configurations
+        """
+        self.config_manager.set_configs(configs)
+    
     def get_plugin_config(self, plugin_name: str) -> Dict[str, Any]:
         """
         Get plugin configuration.
@@ -106,6 +125,18 @@ class MCPManager:
         """
         return self.config_manager.get_config(plugin_name)
     
+    def get_plugin_config_view(self, plugin_name: str) -> Mapping[str, Any]:
+        """
+        Get a read-only view of plugin configuration without copying it.
+        
+        Args:
+            plugin_name: Name of the plugin
+            
+        Returns:
+            Read-only plugin configuration
+        """
+        return self.config_manager.get_config_view(plugin_name)
+    
     def get_plugin_schema(self, plugin_name: str) -> Optional[PluginConfigSchema]:
         """
         Get plugin configuration schema.
@@ -160,21 +191,21 @@ class MCPManager:
         """
         return self.registry.get_active_plugins()
     
-    def get_available_resources(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_available_resources(self) -> Mapping[str, List[Dict[str, Any]]]:
         """
         Get all available resources from plugins.
         
         Returns:
-            Dictionary mapping plugin names to their resources
+            Read-only mapping of plugin names to their resources
         """
         return self.registry.get_resources()
     
-    def get_available_tools(self) -> Dict[str, List[Dict[str, Any]]]:
+    def get_available_tools(self) -> Mapping[str, List[Dict[str, Any]]]:
         """
         Get all available tools from plugins.
         
         Returns:
-            Dictionary mapping plugin names to their tools
+            Read-only mapping of plugin names to their tools
         """
         return self.registry.get_tools()
     
@@ -210,6 +241,19 @@ class MCPManager:
         """
         return await self.registry.get_resource(plugin_name, uri)
     
+    async def get_resources_bulk(self, plugin_name: str, uris: List[str]) -> List[Any]:
+        """
+        Get several plugin resources in one call.
+        
+        Args:
+            plugin_name: Name of the plugin
+            uris: Resource URIs
+            
+        Returns:
+            Resource data in the same order as uris
+        """
+        return await self.registry.get_resources_bulk(plugin_name, uris)
+    
     def add_plugin_state_listener(
         self,
         plugin_name: str,
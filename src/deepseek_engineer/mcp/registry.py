@@ -1,21 +1,25 @@
 """Plugin registry for managing MCP plugins."""
 
 import asyncio
-from typing import Dict, List, Optional, Set, Any, Callable
-from dataclasses import dataclass
+import time
+from typing import Dict, List, Mapping, Optional, Set, Tuple, Any, Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 import logging
 from pathlib import Path
 from enum import Enum
+from types import MappingProxyType
 
 from .base import (
     MCPPlugin,
     PluginMetadata,
     ResourceProvider,
     ToolProvider,
-    PluginError
+    PluginError,
+    SCHEMA_ERRORS,
+    compile_schema
 )
-from .loader import PluginLoader, LoadedPlugin
+from .loader import PluginLoader, LoadedPlugin, dependency_levels
 
 logger = logging.getLogger(__name__)
 
@@ -28,50 +32,148 @@ class PluginState(Enum):
     STOPPED = "stopped"
     ERROR = "error"
 
-@dataclass
+@dataclass(slots=True)
 class PluginInfo:
-    """Extended information about a registered plugin."""
+    """
+    Extended information about a registered plugin.
+    
+    instance starts as the loaded plugin's instance, or None for a lazily
+    loaded plugin until the registry creates it on first use.
+    """
     loaded: LoadedPlugin
     state: PluginState
     error: Optional[str] = None
-    last_state_change: datetime = None
+    instance: Optional[MCPPlugin] = None
+    last_state_change_ns: int = field(default_factory=time.time_ns)
+    cached_resources: Optional[List[Dict[str, Any]]] = None
+    cached_tools: Optional[List[Dict[str, Any]]] = None
 
-    def __post_init__(self):
-        """Initialize timestamp if not provided."""
-        if self.last_state_change is None:
-            self.last_state_change = datetime.now()
+    @property
+    def last_state_change(self) -> datetime:
+        """Time of the last state change."""
+        return datetime.fromtimestamp(self.last_state_change_ns / 1e9)
 
 class PluginRegistry:
     """Central registry for MCP plugins."""
     
-    def __init__(self):
-        """Initialize plugin registry."""
-        self.loader = PluginLoader()
+    # Provider interface, registry index attribute, capability cache key
+    _PROVIDER_KINDS: Tuple[Tuple[type, str, str], ...] = (
+        (ResourceProvider, "_resource_providers", "resources"),
+        (ToolProvider, "_tool_providers", "tools"),
+    )
+    
+    def __init__(self, lazy: bool = False):
+        """
+        Initialize plugin registry.
+        
+        Args:
+            lazy: Defer importing and initializing discovered plugins until
+                one of their tools or resources is first used. Until then
+                they are listed by get_pending_plugins rather than by
+                get_resources/get_tools.
+        """
+        self.loader = PluginLoader(lazy=lazy)
         self.plugins: Dict[str, PluginInfo] = {}
-        self._state_listeners: Dict[str, List[Callable]] = {}
-        self._capability_cache: Dict[str, Dict] = {}
-        self._lock = asyncio.Lock()
+        self._state_listeners: Dict[str, Set[Callable]] = {}
+        # Capability listings per kind, stamped with the kind's generation
+        # at build time; a listing is stale once the generation moves on
+        self._capability_generations: Dict[str, int] = {}
+        self._capability_cache: Dict[str, Tuple[int, Mapping[str, List[Dict[str, Any]]]]] = {}
+        self._metadata_cache: Optional[List[PluginMetadata]] = None
+        self._resource_providers: Set[str] = set()
+        self._tool_providers: Set[str] = set()
+        self._active: Set[str] = set()
+        # (plugin name, tool name) -> argument validator, None for no schema
+        self._tool_validators: Dict[Tuple[str, str], Optional[Callable[[Any], Any]]] = {}
+        self._lock: Optional[asyncio.Lock] = None  # Created on first use
+    
+    def _get_lock(self) -> asyncio.Lock:
+        """Get the registry lock, creating it inside the running loop."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
     
     def add_plugin_directory(self, path: Path):
         """Add a directory to search for plugins."""
         self.loader.add_plugin_dir(path)
     
-    async def discover_and_load(self, configs: Optional[Dict[str, Dict]] = None):
+    async def discover_and_load(
+        self,
+        configs: Optional[Dict[str, Dict]] = None,
+        max_concurrency: int = 8
+    ):
         """
         Discover and load all plugins in registered directories.
         
+        Plugins are loaded concurrently, then registered level by level
+        through register_plugins.
+        
         Args:
             configs: Optional configurations for plugins
+            max_concurrency: Maximum number of plugins loaded at once
         """
-        async with self._lock:
+        async with self._get_lock():
             discovered = self.loader.discover_plugins()
-            
-            for path in discovered:
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def load_one(path: Path) -> Optional[LoadedPlugin]:
+            async with semaphore:
                 try:
-                    plugin = await self.loader.load_plugin(path, configs.get(path.name) if configs else None)
-                    await self.register_plugin(plugin)
+                    return await self.loader.load_plugin(path, configs.get(path.name) if configs else None)
                 except Exception as e:
                     logger.error(f"Failed to load plugin from {path}: {str(e)}")
+                    return None
+        
+        loaded = await asyncio.gather(*(load_one(path) for path in discovered))
+        errors = await self.register_plugins([plugin for plugin in loaded if plugin is not None])
+        for name, error in errors.items():
+            logger.error(f"Failed to register plugin {name}: {str(error)}")
+    
+    async def register_plugins(self, loaded_plugins: List[LoadedPlugin]) -> Dict[str, Exception]:
+        """
+        Register several loaded plugins, initializing independent ones concurrently.
+        
+        Plugins are grouped into levels by their dependencies and each level
+        is initialized with asyncio.gather once the previous one is done. A
+        plugin whose dependency failed is not registered; plugins that did
+        register stay registered when others fail.
+        
+        Args:
+            loaded_plugins: LoadedPlugin instances to register
+            
+        Returns:
+            Dict mapping names of plugins that failed to their errors
+        """
+        batch: Dict[str, LoadedPlugin] = {}
+        for plugin in loaded_plugins:
+            name = plugin.metadata.name
+            if batch.setdefault(name, plugin) is not plugin:
+                logger.error(f"Plugin {name} found more than once; using the first")
+        
+        errors: Dict[str, Exception] = {}
+        async with self._get_lock():
+            deps = {name: plugin.dependencies for name, plugin in batch.items()}
+            for level in dependency_levels(deps):
+                ready = []
+                for name in level:
+                    plugin = batch[name]
+                    failed = plugin.dependencies & errors.keys()
+                    if failed:
+                        errors[name] = PluginError(
+                            f"Plugin {name} depends on failed plugins: {', '.join(sorted(failed))}"
+                        )
+                    else:
+                        ready.append(plugin)
+                
+                results = await asyncio.gather(
+                    *(self._register_plugin_locked(plugin) for plugin in ready),
+                    return_exceptions=True
+                )
+                for plugin, result in zip(ready, results):
+                    if isinstance(result, Exception):
+                        errors[plugin.metadata.name] = result
+        return errors
     
     async def register_plugin(self, loaded_plugin: LoadedPlugin):
         """
@@ -80,33 +182,103 @@ class PluginRegistry:
         Args:
             loaded_plugin: LoadedPlugin instance to register
         """
-        async with self._lock:
-            name = loaded_plugin.metadata.name
-            
-            if name in self.plugins:
-                raise PluginError(f"Plugin {name} already registered")
-            
-            info = PluginInfo(
-                loaded=loaded_plugin,
-                state=PluginState.REGISTERED
-            )
-            self.plugins[name] = info
-            
-            # Clear capability cache
-            self._capability_cache.clear()
+        async with self._get_lock():
+            await self._register_plugin_locked(loaded_plugin)
+    
+    async def _register_plugin_locked(self, loaded_plugin: LoadedPlugin):
+        """Register a loaded plugin; the caller must hold the registry lock."""
+        name = loaded_plugin.metadata.name
+        
+        if name in self.plugins:
+            raise PluginError(f"Plugin {name} already registered")
+        
+        info = PluginInfo(
+            loaded=loaded_plugin,
+            state=PluginState.REGISTERED,
+            instance=loaded_plugin.instance
+        )
+        self.plugins[name] = info
+        self._metadata_cache = None
+        
+        # Notify listeners
+        await self._notify_state_change(name, PluginState.REGISTERED)
+        
+        # Lazily loaded plugins are activated on first use
+        if loaded_plugin.instance is not None:
+            await self._activate_locked(name)
+    
+    async def _activate_locked(self, name: str):
+        """Index and initialize a plugin; the caller must hold the registry lock."""
+        instance = self.plugins[name].instance
+        
+        # Index plugin by capability type
+        for provider_cls, index_attr, _ in self._PROVIDER_KINDS:
+            if isinstance(instance, provider_cls):
+                getattr(self, index_attr).add(name)
+        
+        # Initialize plugin
+        await self._set_plugin_state(name, PluginState.INITIALIZING)
+        try:
+            await instance.initialize()
+            await self._set_plugin_state(name, PluginState.ACTIVE)
+        except Exception as e:
+            error = f"Plugin initialization failed: {str(e)}"
+            await self._set_plugin_state(name, PluginState.ERROR, error)
+            raise
+    
+    async def _ensure_active(self, name: str) -> Optional[PluginInfo]:
+        """
+        Get a plugin's info, activating it first if it was loaded lazily.
+        
+        Args:
+            name: Name of the plugin
             
-            # Notify listeners
-            await self._notify_state_change(name, PluginState.REGISTERED)
+        Returns:
+            Plugin info, or None if no such plugin is registered
+        """
+        info = self.plugins.get(name)
+        if info is not None and info.instance is None:
+            async with self._get_lock():
+                await self._activate_lazy_locked(name, set())
+            info = self.plugins.get(name)
+        return info
+    
+    async def _activate_lazy_locked(self, name: str, chain: Set[str]):
+        """
+        Create and activate a lazily loaded plugin after its dependencies.
+        
+        The caller must hold the registry lock.
+        
+        Args:
+            name: Name of the plugin
+            chain: Names of plugins being activated, to stop at cycles
+        """
+        info = self.plugins.get(name)
+        if info is None or info.instance is not None or name in chain:
+            return
+        chain.add(name)
+        
+        for dep in sorted(info.loaded.dependencies):
+            await self._activate_lazy_locked(dep, chain)
+            dep_info = self.plugins.get(dep)
+            if dep_info is not None and dep_info.state is not PluginState.ACTIVE:
+                raise PluginError(f"Plugin {name} depends on inactive plugin {dep}")
+        
+        info.instance = await self.loader.create_instance(info.loaded)
+        await self._activate_locked(name)
+    
+    async def activate_plugin(self, name: str) -> Optional[MCPPlugin]:
+        """
+        Get a plugin instance by name, activating it if it was loaded lazily.
+        
+        Args:
+            name: Name of the plugin
             
-            # Initialize plugin
-            await self._set_plugin_state(name, PluginState.INITIALIZING)
-            try:
-                await loaded_plugin.instance.initialize()
-                await self._set_plugin_state(name, PluginState.ACTIVE)
-            except Exception as e:
-                error = f"Plugin initialization failed: {str(e)}"
-                await self._set_plugin_state(name, PluginState.ERROR, error)
-                raise
+        Returns:
+            Plugin instance, or None if no such plugin is registered
+        """
+        info = await self._ensure_active(name)
+        return info.instance if info else None
     
     async def unregister_plugin(self, name: str):
         """
@@ -115,7 +287,7 @@ class PluginRegistry:
         Args:
             name: Name of plugin to unregister
         """
-        async with self._lock:
+        async with self._get_lock():
             if name not in self.plugins:
                 return
             
@@ -123,33 +295,110 @@ class PluginRegistry:
             
             # Stop plugin
             await self._set_plugin_state(name, PluginState.STOPPING)
-            try:
-                await info.loaded.instance.shutdown()
-            except Exception as e:
-                logger.error(f"Error stopping plugin {name}: {str(e)}")
+            if info.instance is not None:
+                try:
+                    await info.instance.shutdown()
+                except Exception as e:
+                    logger.error(f"Error stopping plugin {name}: {str(e)}")
             
-            # Unload plugin and dependents
-            await self.loader.unload_plugin(name)
+            await self._remove_plugin_locked(name)
+    
+    async def reload_plugin(self, name: str):
+        """
+        Reload a plugin and re-register it along with its dependents.
+        
+        Args:
+            name: Name of plugin to reload
             
-            # Remove from registry
-            del self.plugins[name]
-            self._capability_cache.clear()
+        Raises:
+            PluginError: If the plugin is not registered or fails to load
+        """
+        async with self._get_lock():
+            if name not in self.plugins:
+                raise PluginError(f"Plugin {name} not registered")
+            
+            # The loader unloads dependents along with the plugin, so note
+            # how to load them again first
+            dependents = [
+                dep for dep in self.loader.get_dependents(name) if dep in self.plugins
+            ]
+            dependent_entries = [
+                (self.plugins[dep].loaded.path, self.loader.get_plugin_config(dep))
+                for dep in reversed(dependents)
+            ]
             
-            # Notify listeners
-            await self._notify_state_change(name, PluginState.STOPPED)
+            stopping = dependents + [name]
+            for plugin_name in stopping:
+                await self._set_plugin_state(plugin_name, PluginState.STOPPING)
+                info = self.plugins[plugin_name]
+                # The loader shuts down the instances it created; instances
+                # of lazily loaded plugins were created by the registry
+                if info.instance is not None and info.loaded.instance is None:
+                    try:
+                        await info.instance.shutdown()
+                    except Exception as e:
+                        logger.error(f"Error stopping plugin {plugin_name}: {str(e)}")
+            
+            try:
+                await self.loader.reload_plugin(name)
+            finally:
+                for plugin_name in stopping:
+                    await self._forget_plugin_locked(plugin_name)
+            
+            await self._register_plugin_locked(self.loader.get_plugin(name))
+            for path, config in dependent_entries:
+                loaded = await self.loader.load_plugin(path, config)
+                await self._register_plugin_locked(loaded)
+    
+    async def _remove_plugin_locked(self, name: str):
+        """Remove a stopped plugin; the caller must hold the registry lock."""
+        # Unload plugin and dependents
+        await self.loader.unload_plugin(name)
+        await self._forget_plugin_locked(name)
+    
+    async def _forget_plugin_locked(self, name: str):
+        """Drop an unloaded plugin from the registry; the caller must hold the lock."""
+        del self.plugins[name]
+        self._metadata_cache = None
+        self._invalidate_capabilities(name)
+        for _, index_attr, _ in self._PROVIDER_KINDS:
+            getattr(self, index_attr).discard(name)
+        self._active.discard(name)
+        for key in [key for key in self._tool_validators if key[0] == name]:
+            del self._tool_validators[key]
+        
+        # Notify listeners
+        await self._notify_state_change(name, PluginState.STOPPED)
     
     def get_plugin(self, name: str) -> Optional[MCPPlugin]:
-        """Get plugin instance by name."""
+        """
+        Get plugin instance by name.
+        
+        Returns None for a lazily loaded plugin that has not been used yet;
+        activate_plugin creates its instance.
+        """
         info = self.plugins.get(name)
-        return info.loaded.instance if info else None
+        return info.instance if info else None
+    
+    def get_pending_plugins(self) -> List[str]:
+        """Get names of lazily loaded plugins that have not been activated yet."""
+        return [name for name, info in self.plugins.items() if info.instance is None]
     
     def get_plugin_info(self, name: str) -> Optional[PluginInfo]:
         """Get plugin information by name."""
         return self.plugins.get(name)
     
     def list_plugins(self) -> List[PluginMetadata]:
-        """Get metadata for all registered plugins."""
-        return [info.loaded.metadata for info in self.plugins.values()]
+        """
+        Get metadata for all registered plugins.
+        
+        Returns:
+            Cached list shared between callers until a plugin is registered
+            or removed; it must not be modified
+        """
+        if self._metadata_cache is None:
+            self._metadata_cache = [info.loaded.metadata for info in self.plugins.values()]
+        return self._metadata_cache
     
     def get_plugin_state(self, name: str) -> Optional[PluginState]:
         """Get current state of a plugin."""
@@ -158,38 +407,65 @@ class PluginRegistry:
     
     def get_active_plugins(self) -> List[str]:
         """Get names of all active plugins."""
+        active = PluginState.ACTIVE
         return [
             name for name, info in self.plugins.items()
-            if info.state == PluginState.ACTIVE
+            if info.state is active
         ]
     
-    def get_resources(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get all available resources from resource providers."""
-        if "resources" not in self._capability_cache:
+    def get_resources(self) -> Mapping[str, List[Dict[str, Any]]]:
+        """
+        Get all available resources from resource providers.
+        
+        Returns:
+            Read-only mapping, reused until a resource provider changes
+        """
+        generation = self._capability_generations.get("resources", 0)
+        cached = self._capability_cache.get("resources")
+        if cached is None or cached[0] != generation:
             resources = {}
+            providers = self._resource_providers
+            active = self._active
+            # Follow registration order so the listing is deterministic
             for name, info in self.plugins.items():
-                if (isinstance(info.loaded.instance, ResourceProvider) and 
-                    info.state == PluginState.ACTIVE):
-                    try:
-                        resources[name] = info.loaded.instance.list_resources()
-                    except Exception as e:
-                        logger.error(f"Error listing resources for {name}: {str(e)}")
-            self._capability_cache["resources"] = resources
-        return self._capability_cache["resources"]
+                if name not in providers or name not in active:
+                    continue
+                try:
+                    if info.cached_resources is None:
+                        info.cached_resources = info.instance.list_resources()
+                    resources[name] = info.cached_resources
+                except Exception as e:
+                    logger.error(f"Error listing resources for {name}: {str(e)}")
+            cached = (generation, MappingProxyType(resources))
+            self._capability_cache["resources"] = cached
+        return cached[1]
     
-    def get_tools(self) -> Dict[str, List[Dict[str, Any]]]:
-        """Get all available tools from tool providers."""
-        if "tools" not in self._capability_cache:
+    def get_tools(self) -> Mapping[str, List[Dict[str, Any]]]:
+        """
+        Get all available tools from tool providers.
+        
+        Returns:
+            Read-only mapping, reused until a tool provider changes
+        """
+        generation = self._capability_generations.get("tools", 0)
+        cached = self._capability_cache.get("tools")
+        if cached is None or cached[0] != generation:
             tools = {}
+            providers = self._tool_providers
+            active = self._active
+            # Follow registration order so the listing is deterministic
             for name, info in self.plugins.items():
-                if (isinstance(info.loaded.instance, ToolProvider) and 
-                    info.state == PluginState.ACTIVE):
-                    try:
-                        tools[name] = info.loaded.instance.list_tools()
-                    except Exception as e:
-                        logger.error(f"Error listing tools for {name}: {str(e)}")
-            self._capability_cache["tools"] = tools
-        return self._capability_cache["tools"]
+                if name not in providers or name not in active:
+                    continue
+                try:
+                    if info.cached_tools is None:
+                        info.cached_tools = info.instance.list_tools()
+                    tools[name] = info.cached_tools
+                except Exception as e:
+                    logger.error(f"Error listing tools for {name}: {str(e)}")
+            cached = (generation, MappingProxyType(tools))
+            self._capability_cache["tools"] = cached
+        return cached[1]
     
     async def execute_tool(
         self,
@@ -208,14 +484,46 @@ class PluginRegistry:
         Returns:
             Tool execution result
         """
-        plugin = self.get_plugin(plugin_name)
-        if not plugin or not isinstance(plugin, ToolProvider):
+        info = await self._ensure_active(plugin_name)
+        if info is None or not isinstance(info.instance, ToolProvider):
             raise PluginError(f"No tool provider plugin named {plugin_name}")
         
-        if self.get_plugin_state(plugin_name) != PluginState.ACTIVE:
+        if info.state is not PluginState.ACTIVE:
             raise PluginError(f"Plugin {plugin_name} is not active")
         
-        return await plugin.execute_tool(tool_name, args)
+        validate = self._get_tool_validator(plugin_name, tool_name, info.instance)
+        if validate is not None:
+            try:
+                validate(args)
+            except SCHEMA_ERRORS as e:
+                raise PluginError(
+                    f"Invalid arguments for tool {tool_name} of {plugin_name}: {str(e)}"
+                )
+        
+        return await info.instance.execute_tool(tool_name, args)
+    
+    def _get_tool_validator(
+        self,
+        plugin_name: str,
+        tool_name: str,
+        provider: ToolProvider
+    ) -> Optional[Callable[[Any], Any]]:
+        """Get the cached argument validator for a tool, compiling it on first use."""
+        key = (plugin_name, tool_name)
+        try:
+            return self._tool_validators[key]
+        except KeyError:
+            pass
+        
+        schema = provider.get_tool_schema(tool_name)
+        try:
+            validate = compile_schema(schema) if schema else None
+        except PluginError as e:
+            raise PluginError(
+                f"Invalid argument schema for tool {tool_name} of {plugin_name}: {str(e)}"
+            )
+        self._tool_validators[key] = validate
+        return validate
     
     async def get_resource(self, plugin_name: str, uri: str) -> Any:
         """
@@ -228,14 +536,34 @@ class PluginRegistry:
         Returns:
             Resource data
         """
-        plugin = self.get_plugin(plugin_name)
-        if not plugin or not isinstance(plugin, ResourceProvider):
+        info = await self._ensure_active(plugin_name)
+        if info is None or not isinstance(info.instance, ResourceProvider):
             raise PluginError(f"No resource provider plugin named {plugin_name}")
         
-        if self.get_plugin_state(plugin_name) != PluginState.ACTIVE:
+        if info.state is not PluginState.ACTIVE:
             raise PluginError(f"Plugin {plugin_name} is not active")
         
-        return await plugin.get_resource(uri)
+        return await info.instance.get_resource(uri)
+    
+    async def get_resources_bulk(self, plugin_name: str, uris: List[str]) -> List[Any]:
+        """
+        Get several resources from a specific plugin in one call.
+        
+        Args:
+            plugin_name: Name of plugin providing the resources
+            uris: Resource URIs
+            
+        Returns:
+            Resource data in the same order as uris
+        """
+        info = await self._ensure_active(plugin_name)
+        if info is None or not isinstance(info.instance, ResourceProvider):
+            raise PluginError(f"No resource provider plugin named {plugin_name}")
+        
+        if info.state is not PluginState.ACTIVE:
+            raise PluginError(f"Plugin {plugin_name} is not active")
+        
+        return await info.instance.get_resources_bulk(uris)
     
     def add_state_listener(
         self,
@@ -243,9 +571,7 @@ class PluginRegistry:
         callback: Callable[[str, PluginState, Optional[str]], None]
     ):
         """Add listener for plugin state changes."""
-        if plugin_name not in self._state_listeners:
-            self._state_listeners[plugin_name] = []
-        self._state_listeners[plugin_name].append(callback)
+        self._state_listeners.setdefault(plugin_name, set()).add(callback)
     
     def remove_state_listener(
         self,
@@ -253,11 +579,11 @@ class PluginRegistry:
         callback: Callable[[str, PluginState, Optional[str]], None]
     ):
         """Remove state change listener."""
-        if plugin_name in self._state_listeners:
-            try:
-                self._state_listeners[plugin_name].remove(callback)
-            except ValueError:
-                pass
+        listeners = self._state_listeners.get(plugin_name)
+        if listeners is not None:
+            listeners.discard(callback)
+            if not listeners:
+                del self._state_listeners[plugin_name]
     
     async def _set_plugin_state(
         self,
@@ -270,9 +596,27 @@ class PluginRegistry:
             info = self.plugins[name]
             info.state = state
             info.error = error
-            info.last_state_change = datetime.now()
+            info.last_state_change_ns = time.time_ns()
+            was_active = name in self._active
+            if state is PluginState.ACTIVE:
+                self._active.add(name)
+            else:
+                self._active.discard(name)
+            if was_active != (name in self._active):
+                self._invalidate_capabilities(name)
+                if was_active:
+                    # Re-query the plugin if it becomes active again
+                    info.cached_resources = None
+                    info.cached_tools = None
             await self._notify_state_change(name, state, error)
     
+    def _invalidate_capabilities(self, name: str):
+        """Mark cached capability listings of a plugin's kinds as stale."""
+        generations = self._capability_generations
+        for _, index_attr, cache_key in self._PROVIDER_KINDS:
+            if name in getattr(self, index_attr):
+                generations[cache_key] = generations.get(cache_key, 0) + 1
+    
     async def _notify_state_change(
         self,
         name: str,
@@ -280,15 +624,37 @@ class PluginRegistry:
         error: Optional[str] = None
     ):
         """Notify listeners of state change."""
-        if name in self._state_listeners:
-            for callback in self._state_listeners[name]:
-                try:
-                    callback(name, state, error)
-                except Exception as e:
-                    logger.error(f"Error in state listener: {str(e)}")
+        listeners = self._state_listeners.get(name)
+        if not listeners:
+            return
+        
+        # Copy so listeners can remove themselves while being notified
+        for callback in tuple(listeners):
+            try:
+                callback(name, state, error)
+            except Exception as e:
+                logger.error(f"Error in state listener: {str(e)}")
     
     async def shutdown(self):
         """Shutdown all plugins and clear registry."""
-        plugin_names = list(self.plugins.keys())
-        for name in reversed(plugin_names):
-            await self.unregister_plugin(name)
\ No newline at end of file
+        async with self._get_lock():
+            plugin_names = list(reversed(self.plugins))
+            for name in plugin_names:
+                await self._set_plugin_state(name, PluginState.STOPPING)
+            
+            # Stop all started plugins concurrently
+            started = [
+                name for name in plugin_names
+                if self.plugins[name].instance is not None
+            ]
+            results = await asyncio.gather(
+                *(self.plugins[name].instance.shutdown() for name in started),
+                return_exceptions=True
+            )
+            for name, result in zip(started, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Error stopping plugin {name}: {str(result)}")
+            
+            for name in plugin_names:
+                await self._remove_plugin_locked(name)
+            self._capability_cache.clear()
@@ -0,0 +1,12 @@
+"""Shared test configuration."""
+
+import pytest
+
+from deepseek_engineer.core import monitoring, security_manager
+
+@pytest.fixture(autouse=True)
+def _isolate_module_state():
+    """Reset module-level caches so tests never depend on run order or worker."""
+    yield
+    monitoring._LABEL_INTERN.clear()
+    security_manager._CONFIG_CACHE.clear()
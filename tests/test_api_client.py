@@ -14,12 +14,18 @@ from deepseek_engineer.core.api_client import (
     RequestTracker
 )
 
-@pytest.fixture
-def mock_openai():
-    """Mock OpenAI client."""
+@pytest.fixture(scope="module")
+def openai_patch():
+    """Patch the OpenAI client once per module."""
     with patch('deepseek_engineer.core.api_client.OpenAI') as mock:
         yield mock
 
+@pytest.fixture
+def mock_openai(openai_patch):
+    """Mock OpenAI client, reset for each test."""
+    openai_patch.reset_mock(return_value=True, side_effect=True)
+    return openai_patch
+
 @pytest.fixture
 def client(mock_openai):
     """Create a DeepSeekClient instance with mocked OpenAI."""
@@ -126,17 +132,25 @@ def test_request_tracker():
     tracker.add_request(20)  # Would exceed token limit
     assert tracker.can_make_request(config) is False
 
-def test_request_tracker_window():
+def test_request_tracker_window(monkeypatch):
     """Test request tracker window expiration."""
+    now = [datetime(2024, 1, 1)]
+    
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now[0]
+    
+    monkeypatch.setattr('deepseek_engineer.core.api_client.datetime', FrozenDatetime)
+    
     tracker = RequestTracker(window_size=1)  # 1 second window
     config = RateLimitConfig(requests_per_minute=1)
     
     tracker.add_request()
     assert tracker.can_make_request(config) is False
     
-    # Wait for window to expire
-    import time
-    time.sleep(1.1)
+    # Advance the clock past the window
+    now[0] += timedelta(seconds=1.1)
     
     # Should be allowed after window expiration
     assert tracker.can_make_request(config) is True
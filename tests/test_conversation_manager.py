@@ -10,6 +10,8 @@ from deepseek_engineer.core.conversation_manager import (
     TokenCounter
 )
 
+FIXED_NOW = datetime(2024, 1, 1, 12, 0, 0)
+
 @pytest.fixture
 def temp_persist_file(tmp_path):
     """Create a temporary file for conversation persistence."""
@@ -24,6 +26,23 @@ def conversation_manager(temp_persist_file):
         model="gpt-4"
     )
 
+@pytest.fixture
+def no_persist(monkeypatch):
+    """Skip saving conversations for tests that don't cover persistence."""
+    monkeypatch.setattr(ConversationManager, 'save_conversation', lambda self: None)
+
+@pytest.fixture(scope="session")
+def shared_token_counter():
+    """Token counter shared across tests; it holds no per-test state."""
+    return TokenCounter()
+
+@pytest.fixture
+def fast_token_counter(conversation_manager):
+    """Conversation manager counting one token per character."""
+    conversation_manager.token_counter.count_tokens = len
+    conversation_manager.token_counter.count_message_tokens = lambda msg: len(msg.content)
+    return conversation_manager
+
 def test_message_creation():
     """Test Message object creation and serialization."""
     # Create message with minimal args
@@ -59,6 +78,7 @@ def test_message_creation():
     assert new_msg.timestamp == msg.timestamp
     assert new_msg.metadata == msg.metadata
 
+@pytest.mark.usefixtures("no_persist")
 def test_add_message(conversation_manager):
     """Test adding messages to conversation."""
     # Add system message
@@ -88,35 +108,35 @@ def test_add_message(conversation_manager):
     assert len(conversation_manager.messages) == 2
     assert conversation_manager.messages[1] == assistant_msg
 
-def test_context_management(conversation_manager):
+@pytest.mark.parametrize("sizes", [
+    (30, 30, 40, 20),
+    (10, 10, 10, 10, 10, 60),
+])
+def test_context_management(fast_token_counter, sizes):
     """Test context management and token limiting."""
-    # Mock token counter to return predictable values
-    conversation_manager.token_counter.count_tokens = lambda x: len(x)
-    conversation_manager.token_counter.count_message_tokens = lambda x: len(x.content)
+    conversation_manager = fast_token_counter
     
-    # Add messages up to token limit
+    # Add messages past the token limit to trigger context trimming
     conversation_manager.add_message("system", "S" * 20)
-    conversation_manager.add_message("user", "A" * 30)
-    conversation_manager.add_message("assistant", "B" * 30)
-    conversation_manager.add_message("user", "C" * 40)
-    
-    # This should trigger context trimming
-    conversation_manager.add_message("assistant", "D" * 20)
+    for i, size in enumerate(sizes):
+        role = "user" if i % 2 == 0 else "assistant"
+        conversation_manager.add_message(role, "M" * size)
     
     # Check that oldest messages were removed to stay under limit
+    assert len(conversation_manager.messages) < len(sizes)
     context = conversation_manager.get_context()
     total_tokens = sum(len(msg["content"]) for msg in context)
     assert total_tokens <= conversation_manager.max_tokens
 
 def test_conversation_persistence(temp_persist_file):
     """Test saving and loading conversations."""
-    # Create manager and add messages
-    manager1 = ConversationManager(persist_path=temp_persist_file)
+    # Add messages without persistence so only the final save hits disk
+    manager1 = ConversationManager()
     manager1.add_message("system", "System prompt")
     manager1.add_message("user", "Hello")
     manager1.add_message("assistant", "Hi there!")
     
-    # Save should happen automatically, but we can force it
+    manager1.persist_path = temp_persist_file
     manager1.save_conversation()
     
     # Create new manager and load conversation
@@ -126,6 +146,7 @@ def test_conversation_persistence(temp_persist_file):
     assert manager2.messages[0].content == "Hello"
     assert manager2.messages[1].content == "Hi there!"
 
+@pytest.mark.usefixtures("no_persist")
 def test_clear_context(conversation_manager):
     """Test clearing conversation context."""
     # Add some messages
@@ -144,13 +165,13 @@ def test_clear_context(conversation_manager):
     assert conversation_manager.system_message is None
     assert len(conversation_manager.messages) == 0
 
+@pytest.mark.usefixtures("no_persist")
 def test_get_conversation_summary(conversation_manager):
     """Test getting conversation summary statistics."""
     # Add messages with known timestamps
-    now = datetime.now()
     conversation_manager.add_message("system", "System")
-    conversation_manager.add_message("user", "First", {"timestamp": now - timedelta(hours=1)})
-    conversation_manager.add_message("assistant", "Last", {"timestamp": now})
+    conversation_manager.add_message("user", "First", {"timestamp": FIXED_NOW - timedelta(hours=1)})
+    conversation_manager.add_message("assistant", "Last", {"timestamp": FIXED_NOW})
     
     summary = conversation_manager.get_conversation_summary()
     assert summary["message_count"] == 2  # Not counting system message
@@ -160,9 +181,9 @@ def test_get_conversation_summary(conversation_manager):
     # Check message timestamps
     assert summary["oldest_message"] <= summary["newest_message"]
 
-def test_token_counter():
+def test_token_counter(shared_token_counter):
     """Test token counting functionality."""
-    counter = TokenCounter()
+    counter = shared_token_counter
     
     # Test basic token counting
     assert counter.count_tokens("Hello, world!") > 0
@@ -173,7 +194,7 @@ def test_token_counter():
     assert tokens > 0
     assert tokens > counter.count_tokens("Test message")  # Should include role tokens
 
-def test_get_context_with_limit(conversation_manager):
+def test_get_context_with_limit(conversation_manager, shared_token_counter):
     """Test getting context with specific token limit."""
     conversation_manager.add_message("system", "S" * 20)
     conversation_manager.add_message("user", "A" * 30)
@@ -181,7 +202,7 @@ def test_get_context_with_limit(conversation_manager):
     
     # Get context with custom limit
     context = conversation_manager.get_context(max_tokens=50)
-    total_tokens = conversation_manager.token_counter.count_tokens(
+    total_tokens = shared_token_counter.count_tokens(
         "".join(msg["content"] for msg in context)
     )
     assert total_tokens <= 50
@@ -1,23 +1,27 @@
 """Tests for the FileManager class."""
 
 import pytest
+import os
 from pathlib import Path
-import tempfile
-import shutil
 from datetime import datetime
 from deepseek_engineer.core.file_manager import FileManager, FileOperationError, FileMetadata
 
-@pytest.fixture
-def temp_dir():
-    """Create a temporary directory for testing."""
-    temp_dir = tempfile.mkdtemp()
-    yield Path(temp_dir)
-    shutil.rmtree(temp_dir)
+@pytest.fixture(scope="module")
+def base_dir(tmp_path_factory):
+    """Create a temporary base directory shared by the module."""
+    return tmp_path_factory.mktemp("files")
+
+@pytest.fixture(scope="module")
+def file_manager(base_dir):
+    """Create a FileManager instance shared by the module."""
+    return FileManager(base_path=base_dir)
 
 @pytest.fixture
-def file_manager(temp_dir):
-    """Create a FileManager instance with a temporary directory."""
-    return FileManager(base_path=temp_dir)
+def temp_dir(base_dir, request):
+    """Create a fresh directory for each test under the shared base."""
+    path = base_dir / request.node.name
+    path.mkdir()
+    return path
 
 def test_init_default():
     """Test FileManager initialization with default parameters."""
@@ -29,16 +33,27 @@ def test_init_with_path(temp_dir):
     fm = FileManager(base_path=temp_dir)
     assert fm.base_path == temp_dir
 
-def test_read_write_file(file_manager, temp_dir):
-    """Test basic file read/write operations."""
-    test_file = temp_dir / "test.txt"
+@pytest.mark.parametrize("operation", ["read_write", "copy", "move"])
+def test_file_operations(file_manager, temp_dir, operation):
+    """Test writing a file and reading it back after each operation."""
+    source = temp_dir / "source.txt"
+    dest = temp_dir / "dest.txt"
     content = "Hello, World!"
     
-    file_manager.write_file(test_file, content)
-    assert test_file.exists()
+    file_manager.write_file(source, content)
+    assert source.exists()
     
-    read_content = file_manager.read_file(test_file)
-    assert read_content == content
+    if operation == "read_write":
+        dest = source
+    elif operation == "copy":
+        file_manager.copy_file(source, dest)
+        assert source.exists()
+    else:
+        file_manager.move_file(source, dest)
+        assert not source.exists()
+    
+    assert dest.exists()
+    assert file_manager.read_file(dest) == content
 
 def test_write_file_creates_directories(file_manager, temp_dir):
     """Test that write_file creates necessary directories."""
@@ -86,18 +101,6 @@ def test_list_files(file_manager, temp_dir):
     all_txt_files = file_manager.list_files(temp_dir, "*.txt", recursive=True)
     assert len(all_txt_files) == 3
 
-def test_copy_file(file_manager, temp_dir):
-    """Test file copying functionality."""
-    source = temp_dir / "source.txt"
-    dest = temp_dir / "dest.txt"
-    content = "Test content"
-    
-    file_manager.write_file(source, content)
-    file_manager.copy_file(source, dest)
-    
-    assert dest.exists()
-    assert file_manager.read_file(dest) == content
-
 def test_copy_file_no_overwrite(file_manager, temp_dir):
     """Test copy file with overwrite protection."""
     source = temp_dir / "source.txt"
@@ -109,19 +112,6 @@ def test_copy_file_no_overwrite(file_manager, temp_dir):
     with pytest.raises(FileOperationError):
         file_manager.copy_file(source, dest, overwrite=False)
 
-def test_move_file(file_manager, temp_dir):
-    """Test file moving functionality."""
-    source = temp_dir / "source.txt"
-    dest = temp_dir / "dest.txt"
-    content = "Move test"
-    
-    file_manager.write_file(source, content)
-    file_manager.move_file(source, dest)
-    
-    assert not source.exists()
-    assert dest.exists()
-    assert file_manager.read_file(dest) == content
-
 def test_delete_file(file_manager, temp_dir):
     """Test file deletion."""
     test_file = temp_dir / "delete_test.txt"
@@ -137,11 +127,15 @@ def test_get_file_info(file_manager, temp_dir):
     content = "Test content"
     file_manager.write_file(test_file, content)
     
+    # Pin the modification time so the expected value is fixed
+    mtime = datetime(2024, 1, 1).timestamp()
+    os.utime(test_file, (mtime, mtime))
+    
     info = file_manager.get_file_info(test_file)
     assert isinstance(info, FileMetadata)
     assert info.path == test_file
     assert info.size == len(content)
-    assert isinstance(info.modified_time, datetime)
+    assert info.modified_time == datetime(2024, 1, 1)
     assert info.content_type == "text/plain"
 
 def test_metadata_caching(file_manager, temp_dir):
@@ -152,11 +146,12 @@ def test_metadata_caching(file_manager, temp_dir):
     # Get info twice - second should use cache
     info1 = file_manager.get_file_info(test_file)
     info2 = file_manager.get_file_info(test_file)
-    assert info1 == info2
+    assert info2 is info1
     
     # Clear cache and get new info
     file_manager.clear_cache()
     info3 = file_manager.get_file_info(test_file)
+    assert info3 is not info1
     assert info3.hash == info1.hash  # Content hasn't changed
 
 def test_error_handling(file_manager):
@@ -4,36 +4,124 @@ import pytest
 from pathlib import Path
 from unittest.mock import Mock, patch, call
 import argparse
-import os
 from io import StringIO
+from types import SimpleNamespace
+
+from rich.console import Console
 
 from deepseek_engineer.main import (
     create_arg_parser,
     display_status,
     handle_file_changes,
-    main
+    main,
+    run
 )
 from deepseek_engineer.app import DeepSeekEngineer
 from deepseek_engineer.core.security_manager import SecurityViolation
 
-@pytest.fixture
+@pytest.fixture(scope="module", autouse=True)
 def mock_console():
-    """Mock rich console output."""
+    """Mock rich console output for every test in the module."""
     with patch('deepseek_engineer.main.console') as mock:
         yield mock
 
 @pytest.fixture
+def recording_console(monkeypatch):
+    """Replace the rich console with one recording to memory."""
+    console = Console(file=StringIO(), record=True, force_terminal=False, width=120)
+    monkeypatch.setattr('deepseek_engineer.main.console', console)
+    return console
+
+@pytest.fixture(scope="module")
+def mock_prompt():
+    """Mock rich prompt input."""
+    with patch('deepseek_engineer.main.Prompt') as mock:
+        yield mock
+
+STATUS = {
+    "system_status": {
+        "system_metrics": {
+            "cpu_percent": 50.0,
+            "memory_percent": 60.0
+        }
+    },
+    "conversation_summary": {
+        "message_count": 10,
+        "total_tokens": 1000
+    },
+    "security_status": {
+        "auth_required": True,
+        "rate_limit_config": {
+            "window": 60,
+            "max_requests": 100
+        }
+    }
+}
+
+class StubApp:
+    """Minimal stand-in for the DeepSeekEngineer API used by the CLI."""
+    
+    _METHODS = (
+        "process_request",
+        "get_status",
+        "clear_conversation",
+        "generate_auth_token",
+        "export_metrics",
+        "export_events"
+    )
+    
+    def __init__(self):
+        self.security = SimpleNamespace(config=SimpleNamespace(require_auth=False))
+        self.process_request = Mock(return_value={"response": "", "file_changes": []})
+        self.get_status = Mock(return_value=STATUS)
+        self.clear_conversation = Mock()
+        self.generate_auth_token = Mock(return_value="test_token")
+        self.export_metrics = Mock()
+        self.export_events = Mock()
+    
+    def reset_mock(self, **kwargs):
+        """Reset recorded calls on every stubbed method."""
+        for name in self._METHODS:
+            getattr(self, name).reset_mock(**kwargs)
+        self.security.config.require_auth = False
+
+@pytest.fixture(scope="module")
 def mock_app():
-    """Create mock DeepSeekEngineer instance."""
-    with patch('deepseek_engineer.main.DeepSeekEngineer') as mock_class:
-        mock_instance = Mock()
-        mock_class.return_value = mock_instance
-        yield mock_instance
+    """Create a stub DeepSeekEngineer instance."""
+    app = StubApp()
+    with patch('deepseek_engineer.main.DeepSeekEngineer', return_value=app):
+        yield app
 
-def test_argument_parser():
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    """Provide an API key through the environment."""
+    monkeypatch.setenv('DEEPSEEK_API_KEY', 'test_key')
+
+@pytest.fixture(autouse=True)
+def reset_mocks(request):
+    """Reset the module-scoped mocks used by each test."""
+    for name in ("mock_console", "mock_prompt", "mock_app"):
+        if name in request.fixturenames:
+            request.getfixturevalue(name).reset_mock(side_effect=True)
+
+def _printed(mock_console) -> str:
+    """Join everything printed to a mocked console, serializing each call once."""
+    return "\n".join(
+        str(c.args[0]) for c in mock_console.print.call_args_list if c.args
+    )
+
+@pytest.fixture(scope="module")
+def parser():
+    """Create the command line argument parser."""
+    return create_arg_parser()
+
+@pytest.fixture(scope="module")
+def default_args(parser):
+    """Parse an empty command line once for tests that call run() directly."""
+    return parser.parse_args([])
+
+def test_argument_parser(parser):
     """Test command line argument parsing."""
-    parser = create_arg_parser()
-    
     # Test with all arguments
     args = parser.parse_args([
         '--base-path', '/test/path',
@@ -54,40 +142,21 @@ def test_argument_parser():
     assert args.max_tokens == 1000
     assert args.export_metrics == Path('/test/metrics.json')
     assert args.export_events == Path('/test/events.json')
+    
+    # The parser is built once and reused
+    assert create_arg_parser() is parser
 
-def test_display_status(mock_console):
+def test_display_status(recording_console):
     """Test status display formatting."""
-    mock_app = Mock()
-    mock_app.get_status.return_value = {
-        "system_status": {
-            "system_metrics": {
-                "cpu_percent": 50.0,
-                "memory_percent": 60.0
-            }
-        },
-        "conversation_summary": {
-            "message_count": 10,
-            "total_tokens": 1000
-        },
-        "security_status": {
-            "auth_required": True,
-            "rate_limit_config": {
-                "window": 60,
-                "max_requests": 100
-            }
-        }
-    }
-    
-    display_status(mock_app)
+    display_status(StubApp())
     
-    # Verify console output calls
-    assert mock_console.print.called
-    calls = mock_console.print.call_args_list
-    assert any("System Metrics" in str(call)) 
-    assert any("Conversation Summary" in str(call))
-    assert any("Security Status" in str(call))
-
-def test_handle_file_changes(mock_console):
+    # Verify console output
+    output = recording_console.export_text()
+    assert "System Metrics" in output
+    assert "Conversation Summary" in output
+    assert "Security Status" in output
+
+def test_handle_file_changes(recording_console):
     """Test file changes display formatting."""
     changes = [
         {
@@ -105,109 +174,98 @@ def test_handle_file_changes(mock_console):
     handle_file_changes(changes)
     
     # Verify table was printed
-    assert mock_console.print.called
-    table_call = mock_console.print.call_args[0][0]
-    assert "File Changes" in str(table_call)
-    assert "test.py" in str(table_call)
-    assert "config.json" in str(table_call)
-
-@patch('deepseek_engineer.main.Prompt')
-def test_main_interaction_loop(mock_prompt, mock_app, mock_console):
-    """Test main interaction loop."""
-    # Mock user inputs
-    mock_prompt.ask.side_effect = [
-        "test command",  # Normal command
-        "status",        # Status command
-        "clear",         # Clear command
-        "exit"          # Exit command
-    ]
-    
-    # Mock app responses
-    mock_app.process_request.return_value = {
-        "response": "Test response",
-        "file_changes": []
-    }
-    mock_app.security.config.require_auth = True
-    mock_app.generate_auth_token.return_value = "test_token"
+    output = recording_console.export_text()
+    assert "File Changes" in output
+    assert "test.py" in output
+    assert "config.json" in output
+
+def test_handle_no_file_changes(mock_console):
+    """Test that an empty change list prints nothing."""
+    handle_file_changes([])
+    mock_console.print.assert_not_called()
+
+@pytest.mark.parametrize(
+    "inputs,process_effect,require_auth,called,expected_output",
+    [
+        (
+            ["test command", "status", "clear", "exit"],
+            [{"response": "Test response", "file_changes": []}],
+            True,
+            ["process_request", "get_status", "clear_conversation", "generate_auth_token"],
+            ["Goodbye"]
+        ),
+        (
+            ["test command", "bad command", "exit"],
+            [SecurityViolation("Access denied"), Exception("General error")],
+            False,
+            ["process_request"],
+            ["Security Error", "Error: General error"]
+        ),
+        (
+            KeyboardInterrupt,
+            None,
+            False,
+            [],
+            ["Interrupted"]
+        ),
+    ],
+    ids=["interaction_loop", "error_handling", "keyboard_interrupt"]
+)
+def test_main_scenarios(
+    mock_prompt,
+    mock_app,
+    mock_console,
+    inputs,
+    process_effect,
+    require_auth,
+    called,
+    expected_output
+):
+    """Test the main interaction loop with different user inputs."""
+    mock_prompt.ask.side_effect = inputs
+    mock_app.process_request.side_effect = process_effect
+    mock_app.security.config.require_auth = require_auth
     
-    # Run main
-    with patch('deepseek_engineer.main.DeepSeekEngineer', return_value=mock_app):
-        with patch.dict(os.environ, {'DEEPSEEK_API_KEY': 'test_key'}):
-            main()
+    main([])
     
     # Verify interactions
-    assert mock_app.process_request.called
-    assert mock_app.get_status.called
-    assert mock_app.clear_conversation.called
-
-@patch('deepseek_engineer.main.Prompt')
-def test_main_error_handling(mock_prompt, mock_app, mock_console):
-    """Test error handling in main loop."""
-    # Mock user inputs
-    mock_prompt.ask.side_effect = [
-        "test command",  # Raises SecurityViolation
-        "bad command",   # Raises general Exception
-        "exit"
-    ]
-    
-    # Mock app responses
-    mock_app.process_request.side_effect = [
-        SecurityViolation("Access denied"),
-        Exception("General error")
-    ]
-    mock_app.security.config.require_auth = False
-    
-    # Run main
-    with patch('deepseek_engineer.main.DeepSeekEngineer', return_value=mock_app):
-        with patch.dict(os.environ, {'DEEPSEEK_API_KEY': 'test_key'}):
-            main()
+    for method in called:
+        assert getattr(mock_app, method).called
     
-    # Verify error messages
-    error_messages = [
-        call_args[0][0] for call_args in mock_console.print.call_args_list
-        if "Error" in str(call_args[0][0])
-    ]
-    assert any("Security Error" in str(msg) for msg in error_messages)
-    assert any("Error: General error" in str(msg) for msg in error_messages)
+    # Verify console output
+    printed = _printed(mock_console)
+    for expected in expected_output:
+        assert expected in printed
 
-def test_main_export_commands(mock_app, mock_console):
+def test_main_export_commands(mock_app, default_args):
     """Test metric and event export commands."""
+    env = {'DEEPSEEK_API_KEY': 'test_key'}
+    
     # Test metrics export
-    with patch('sys.argv', ['deepseek', '--export-metrics', '/test/metrics.json']):
-        with patch.dict(os.environ, {'DEEPSEEK_API_KEY': 'test_key'}):
-            main()
-    mock_app.export_metrics.assert_called_once()
+    args = argparse.Namespace(**{
+        **vars(default_args),
+        'export_metrics': Path('/test/metrics.json')
+    })
+    run(args, env)
+    mock_app.export_metrics.assert_called_once_with(Path('/test/metrics.json'))
     
     # Reset mock
     mock_app.reset_mock()
     
     # Test events export
-    with patch('sys.argv', ['deepseek', '--export-events', '/test/events.json']):
-        with patch.dict(os.environ, {'DEEPSEEK_API_KEY': 'test_key'}):
-            main()
-    mock_app.export_events.assert_called_once()
-
-def test_main_keyboard_interrupt(mock_app, mock_console):
-    """Test handling of keyboard interrupt."""
-    with patch('deepseek_engineer.main.Prompt.ask', side_effect=KeyboardInterrupt):
-        with patch.dict(os.environ, {'DEEPSEEK_API_KEY': 'test_key'}):
-            main()
-    
-    # Verify graceful exit message
-    assert any(
-        "Interrupted" in str(call_args[0][0])
-        for call_args in mock_console.print.call_args_list
-    )
+    args = argparse.Namespace(**{
+        **vars(default_args),
+        'export_events': Path('/test/events.json')
+    })
+    run(args, env)
+    mock_app.export_events.assert_called_once_with(Path('/test/events.json'))
 
-def test_main_missing_api_key(mock_console):
+def test_main_missing_api_key(mock_console, default_args):
     """Test handling of missing API key."""
-    with patch.dict(os.environ, {}, clear=True):
-        with pytest.raises(SystemExit):
-            main()
+    with pytest.raises(SystemExit):
+        run(default_args, {})
     
     # Verify error message
-    error_calls = [
-        call_args[0][0] for call_args in mock_console.print.call_args_list
-        if "Error" in str(call_args[0][0])
-    ]
-    assert any("API key" in str(msg) for msg in error_calls)
\ No newline at end of file
+    printed = _printed(mock_console)
+    assert "Error" in printed
+    assert "API key" in printed
\ No newline at end of file
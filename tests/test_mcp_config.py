@@ -1,10 +1,10 @@
 """Tests for the MCP configuration system."""
 
+import contextlib
 import pytest
 import os
 from pathlib import Path
 import json
-import yaml
 from unittest.mock import patch
 
 from deepseek_engineer.mcp.config import (
@@ -21,12 +21,26 @@ def temp_config_dir(tmp_path):
     config_dir.mkdir()
     return config_dir
 
+@pytest.fixture(scope="module")
+def config_manager(tmp_path_factory):
+    """Create a configuration manager shared by the module's tests."""
+    return ConfigurationManager(config_dir=tmp_path_factory.mktemp("cfg"))
+
+@pytest.fixture(autouse=True)
+def _reset_config_manager(config_manager):
+    """Drop configurations and schemas registered by the previous test."""
+    yield
+    config_manager.clear_all_configs()
+    config_manager._schemas.clear()
+    config_manager._env_paths.clear()
+    config_manager._validators.clear()
+
 @pytest.fixture
-def config_manager(temp_config_dir):
-    """Create a configuration manager with test directory."""
+def fresh_config_manager(temp_config_dir):
+    """Create a configuration manager with its own test directory."""
     return ConfigurationManager(config_dir=temp_config_dir)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def test_schema():
     """Create a test configuration schema."""
     return PluginConfigSchema(
@@ -66,41 +80,67 @@ def test_schema_creation():
     assert new_schema.properties == schema.properties
     assert new_schema.required == schema.required
 
-def test_config_validation(config_manager, test_schema):
+@pytest.mark.parametrize("config,expected_exc", [
+    pytest.param(
+        {
+            "host": "localhost",
+            "port": 8080,
+            "debug": True,
+            "settings": {
+                "timeout": 30,
+                "retries": 3
+            }
+        },
+        None,
+        id="valid"
+    ),
+    pytest.param(
+        {"host": "localhost", "debug": True},
+        ConfigValidationError,
+        id="missing_required"
+    ),
+    pytest.param(
+        {"host": "localhost", "port": "8080"},  # Port should be integer
+        ConfigValidationError,
+        id="wrong_type"
+    ),
+])
+def test_config_validation(config_manager, test_schema, config, expected_exc):
     """Test configuration validation against schema."""
     config_manager.register_schema("test", test_schema)
     
-    # Valid configuration
-    valid_config = {
-        "host": "localhost",
-        "port": 8080,
-        "debug": True,
-        "settings": {
-            "timeout": 30,
-            "retries": 3
-        }
-    }
-    config_manager.set_config("test", valid_config)
+    ctx = pytest.raises(expected_exc) if expected_exc else contextlib.nullcontext()
+    with ctx:
+        config_manager.set_config("test", config)
+
+def test_shared_schema_validator(config_manager, test_schema):
+    """Test that plugins registered with one schema share its validator."""
+    config_manager.register_schema("plugin1", test_schema)
+    config_manager.register_schema("plugin2", test_schema)
+    
+    validator = config_manager._get_validator("plugin1")
+    assert config_manager._get_validator("plugin2") is validator
     
-    # Invalid configuration (missing required field)
-    invalid_config = {
-        "host": "localhost",
-        "debug": True
-    }
     with pytest.raises(ConfigValidationError):
-        config_manager.set_config("test", invalid_config)
+        config_manager.set_config("plugin2", {"host": "localhost"})
+
+def test_schema_replacement(config_manager, test_schema):
+    """Test registering a new schema replaces the plugin's validator."""
+    config_manager.register_schema("test", test_schema)
+    config_manager.register_schema("test", PluginConfigSchema(
+        type="object",
+        properties={"name": {"type": "string"}},
+        required=["name"]
+    ))
     
-    # Invalid configuration (wrong type)
-    invalid_config = {
-        "host": "localhost",
-        "port": "8080"  # Should be integer
-    }
+    assert list(config_manager._validators) == ["test"]
+    config_manager.set_config("test", {"name": "example"})
     with pytest.raises(ConfigValidationError):
-        config_manager.set_config("test", invalid_config)
+        config_manager.set_config("test", {"host": "localhost", "port": 8080})
 
-def test_config_persistence(config_manager, test_schema):
+def test_config_persistence(fresh_config_manager, test_schema):
     """Test configuration persistence to file."""
-    config_manager.register_schema("test", test_schema)
+    fresh_config_manager.register_schema("test", test_schema)
     
     test_config = {
         "host": "localhost",
@@ -108,31 +148,50 @@ def test_config_persistence(config_manager, test_schema):
     }
     
     # Save configuration
-    config_manager.set_config("test", test_config)
+    fresh_config_manager.set_config("test", test_config)
     
     # Create new manager and load config
-    new_manager = ConfigurationManager(config_dir=config_manager.config_dir)
+    new_manager = ConfigurationManager(config_dir=fresh_config_manager.config_dir)
     new_manager.register_schema("test", test_schema)
     loaded_config = new_manager.get_config("test")
     
     assert loaded_config == test_config
 
-def test_yaml_config(config_manager, test_schema):
+def test_config_save_permissions(fresh_config_manager, test_schema):
+    """Test saving keeps file permissions and cleans up after failures."""
+    fresh_config_manager.register_schema("test", test_schema)
+    config_path = fresh_config_manager.config_dir / "test.yaml"
+    
+    # New files get the same mode as any file created under the umask
+    probe = fresh_config_manager.config_dir / "probe"
+    probe.touch()
+    fresh_config_manager.set_config("test", {"host": "localhost", "port": 8080})
+    assert config_path.stat().st_mode & 0o777 == probe.stat().st_mode & 0o777
+    
+    config_path.chmod(0o640)
+    fresh_config_manager.set_config("test", {"host": "example.com", "port": 8080})
+    assert config_path.stat().st_mode & 0o777 == 0o640
+    
+    with patch("deepseek_engineer.mcp.config.os.replace", side_effect=OSError("boom")):
+        fresh_config_manager.set_config("test", {"host": "other", "port": 8080})
+    assert list(fresh_config_manager.config_dir.glob("*.tmp")) == []
+    assert "example.com" in config_path.read_text()
+
+def test_yaml_config(fresh_config_manager, test_schema):
     """Test YAML configuration handling."""
-    config_manager.register_schema("test", test_schema)
+    fresh_config_manager.register_schema("test", test_schema)
     
     # Create YAML config file
-    config_path = config_manager.config_dir / "test.yaml"
+    config_path = fresh_config_manager.config_dir / "test.yaml"
     test_config = {
         "host": "localhost",
         "port": 8080
     }
     
-    with open(config_path, "w") as f:
-        yaml.safe_dump(test_config, f)
+    config_path.write_text("host: localhost\nport: 8080\n")
     
     # Load configuration
-    loaded_config = config_manager.get_config("test")
+    loaded_config = fresh_config_manager.get_config("test")
     assert loaded_config == test_config
 
 def test_environment_overrides(config_manager, test_schema):
@@ -234,17 +293,16 @@ def test_config_clearing(config_manager, test_schema):
     assert config_manager.get_config("test") == {}
 
 def test_error_handling(config_manager):
-    """Test configuration error handling."""
-    # Test unregistered schema
+    """Test that configuring an unregistered plugin fails."""
     with pytest.raises(ConfigError):
         config_manager.set_config("unknown", {})
-    
-    # Test invalid config file
+
+def test_invalid_config_file(config_manager):
+    """Test that an unreadable config file is logged, not raised."""
     config_path = config_manager.config_dir / "invalid.yaml"
     with open(config_path, "w") as f:
         f.write("invalid: yaml: content")
     
-    # Should not raise exception but log error
     config_manager.register_schema("invalid", PluginConfigSchema())
     config = config_manager.get_config("invalid")
     assert config == {}
@@ -276,4 +334,73 @@ def test_config_isolation(config_manager, test_schema):
     config_manager.set_config("plugin2", config2)
     
     assert config_manager.get_config("plugin1") == config1
-    assert config_manager.get_config("plugin2") == config2
\ No newline at end of file
+    assert config_manager.get_config("plugin2") == config2
+
+def test_environment_override_paths(config_manager):
+    """Test environment overrides follow schema property names."""
+    schema = PluginConfigSchema(
+        type="object",
+        properties={
+            "db_host": {"type": "string"},
+            "settings": {
+                "type": "object",
+                "properties": {
+                    "max_retries": {"type": "integer"}
+                }
+            }
+        }
+    )
+    config_manager.register_schema("paths", schema)
+    
+    with patch.dict(os.environ, {
+        "DEEPSEEK_PLUGIN_PATHS_DB_HOST": "example.com",
+        "DEEPSEEK_PLUGIN_PATHS_SETTINGS_MAX_RETRIES": "5",
+        "DEEPSEEK_PLUGIN_PATHS_EXTRA_VALUE": "x"
+    }):
+        config = config_manager._apply_env_overrides("paths", {})
+    
+    assert config["db_host"] == "example.com"
+    assert config["settings"]["max_retries"] == 5
+    # Keys unknown to the schema fall back to splitting on underscores
+    assert config["extra"]["value"] == "x"
+
+def test_config_view(config_manager, test_schema):
+    """Test read-only configuration views."""
+    config_manager.register_schema("test", test_schema)
+    config = {
+        "host": "localhost",
+        "port": 8080
+    }
+    config_manager.set_config("test", config)
+    
+    view = config_manager.get_config_view("test")
+    assert view == config
+    with pytest.raises(TypeError):
+        view["host"] = "example.com"
+    
+    # New views see the latest configuration
+    config_manager.set_config("test", {"host": "example.com", "port": 9090})
+    assert config_manager.get_config_view("test")["host"] == "example.com"
+
+def test_bulk_config_updates(config_manager, test_schema):
+    """Test setting several configurations at once."""
+    config_manager.register_schema("plugin1", test_schema)
+    config_manager.register_schema("plugin2", test_schema)
+    
+    configs = {
+        "plugin1": {"host": "host1", "port": 8081},
+        "plugin2": {"host": "host2", "port": 8082}
+    }
+    config_manager.set_configs(configs)
+    
+    for name, config in configs.items():
+        assert config_manager.get_config(name) == config
+        assert (config_manager.config_dir / f"{name}.yaml").exists()
+    
+    # One invalid entry leaves every configuration unchanged
+    with pytest.raises(ConfigValidationError):
+        config_manager.set_configs({
+            "plugin1": {"host": "changed", "port": 9091},
+            "plugin2": {"host": "changed"}
+        })
+    assert config_manager.get_config("plugin1") == configs["plugin1"]
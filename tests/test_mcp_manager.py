@@ -1,6 +1,7 @@
 """Tests for the MCP manager."""
 
 import pytest
+import pytest_asyncio
 from pathlib import Path
 from unittest.mock import Mock, AsyncMock, patch, call
 import asyncio
@@ -44,21 +45,17 @@ class TestToolPlugin(ToolProvider):
     def list_tools(self): return [{"name": "test"}]
     def get_tool_schema(self, name): return {}
 
-@pytest.fixture
-def temp_plugin_dir(tmp_path):
-    """Create a temporary plugin directory."""
-    plugin_dir = tmp_path / "plugins"
-    plugin_dir.mkdir()
-    return plugin_dir
+@pytest.fixture(scope="session")
+def temp_plugin_dir(tmp_path_factory):
+    """Create a temporary plugin directory shared by the session."""
+    return tmp_path_factory.mktemp("plugins")
 
-@pytest.fixture
-def temp_config_dir(tmp_path):
-    """Create a temporary config directory."""
-    config_dir = tmp_path / "config"
-    config_dir.mkdir()
-    return config_dir
+@pytest.fixture(scope="session")
+def temp_config_dir(tmp_path_factory):
+    """Create a temporary config directory shared by the session."""
+    return tmp_path_factory.mktemp("config")
 
-@pytest.fixture
+@pytest_asyncio.fixture(loop_scope="module")
 async def mcp_manager(temp_plugin_dir, temp_config_dir):
     """Create an MCP manager instance."""
     manager = MCPManager(
@@ -68,7 +65,7 @@ async def mcp_manager(temp_plugin_dir, temp_config_dir):
     yield manager
     await manager.shutdown()
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def test_plugin_metadata():
     """Create test plugin metadata."""
     return create_plugin_metadata(
@@ -78,7 +75,20 @@ def test_plugin_metadata():
         author="Test"
     )
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def sample_plugin_metadatas():
+    """Create metadata for two listed test plugins."""
+    return [
+        create_plugin_metadata(
+            name=f"test{i}",
+            version="1.0.0",
+            description=f"Test {i}",
+            author="Test"
+        )
+        for i in (1, 2)
+    ]
+
+@pytest.fixture(scope="module")
 def test_plugin_schema():
     """Create test plugin schema."""
     return PluginConfigSchema(
@@ -88,12 +98,12 @@ def test_plugin_schema():
         }
     )
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_initialization(mcp_manager, temp_plugin_dir):
     """Test plugin system initialization."""
     # Create test plugin
     plugin_dir = temp_plugin_dir / "test"
-    plugin_dir.mkdir()
+    plugin_dir.mkdir(exist_ok=True)
     
     with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load:
         mock_load.return_value = TestPlugin
@@ -101,7 +111,7 @@ async def test_initialization(mcp_manager, temp_plugin_dir):
     
     assert len(mcp_manager.get_active_plugins()) >= 0
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_plugin_configuration(mcp_manager, test_plugin_metadata, test_plugin_schema):
     """Test plugin configuration management."""
     # Register schema
@@ -119,7 +129,7 @@ async def test_plugin_configuration(mcp_manager, test_plugin_metadata, test_plug
     schema = mcp_manager.get_plugin_schema("test")
     assert schema == test_plugin_schema
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_resource_handling(mcp_manager):
     """Test resource provider functionality."""
     with patch("deepseek_engineer.mcp.registry.PluginRegistry.get_resources") as mock_resources:
@@ -131,7 +141,7 @@ async def test_resource_handling(mcp_manager):
         assert "test" in resources
         assert resources["test"][0]["name"] == "test_resource"
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_tool_handling(mcp_manager):
     """Test tool provider functionality."""
     with patch("deepseek_engineer.mcp.registry.PluginRegistry.get_tools") as mock_tools:
@@ -143,14 +153,14 @@ async def test_tool_handling(mcp_manager):
         assert "test" in tools
         assert tools["test"][0]["name"] == "test_tool"
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_plugin_state_management(mcp_manager):
     """Test plugin state management."""
     # Mock state changes
-    states = []
+    states: set[tuple[str, PluginState]] = set()
     
     def state_listener(name, state, error):
-        states.append((name, state))
+        states.add((name, state))
     
     mcp_manager.add_plugin_state_listener("test", state_listener)
     
@@ -166,34 +176,59 @@ async def test_plugin_state_management(mcp_manager):
     await mcp_manager.registry._set_plugin_state("test", PluginState.STOPPED)
     assert len(states) == 2  # No new states added
 
-@pytest.mark.asyncio
-async def test_tool_execution(mcp_manager):
+@pytest.fixture
+def fake_registry(mcp_manager, monkeypatch):
+    """Stub the registry calls the manager delegates to with plain coroutines."""
+    async def execute_tool(plugin_name, tool_name, args):
+        return {"result": "success"}
+    
+    async def get_resource(plugin_name, uri):
+        return {"data": "test"}
+    
+    monkeypatch.setattr(mcp_manager.registry, "execute_tool", execute_tool)
+    monkeypatch.setattr(mcp_manager.registry, "get_resource", get_resource)
+
+@pytest.mark.asyncio(loop_scope="module")
+async def test_tool_execution(mcp_manager, fake_registry):
     """Test tool execution."""
-    with patch("deepseek_engineer.mcp.registry.PluginRegistry.execute_tool") as mock_execute:
-        mock_execute.return_value = {"result": "success"}
-        
-        result = await mcp_manager.execute_tool(
-            "test",
-            "test_tool",
-            {"arg": "value"}
-        )
-        assert result["result"] == "success"
+    result = await mcp_manager.execute_tool(
+        "test",
+        "test_tool",
+        {"arg": "value"}
+    )
+    assert result["result"] == "success"
 
-@pytest.mark.asyncio
-async def test_resource_access(mcp_manager):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_resource_access(mcp_manager, fake_registry):
     """Test resource access."""
-    with patch("deepseek_engineer.mcp.registry.PluginRegistry.get_resource") as mock_get:
-        mock_get.return_value = {"data": "test"}
-        
-        result = await mcp_manager.get_resource("test", "test://uri")
-        assert result["data"] == "test"
+    result = await mcp_manager.get_resource("test", "test://uri")
+    assert result["data"] == "test"
 
-@pytest.mark.asyncio
-async def test_plugin_reload(mcp_manager):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_plugin_reload(tmp_path, temp_config_dir):
     """Test plugin reloading."""
-    with patch("deepseek_engineer.mcp.registry.PluginRegistry.reload_plugin") as mock_reload:
-        await mcp_manager.reload_plugin("test")
-        mock_reload.assert_called_once_with("test")
+    plugin_dir = tmp_path / "plugins" / "tool"
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "plugin.json").write_text(
+        '{"name": "tool", "version": "1.0.0", "description": "Tool", "author": "Test"}'
+    )
+    manager = MCPManager(plugin_dirs=[plugin_dir.parent], config_dir=temp_config_dir)
+    
+    with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load:
+        mock_load.return_value = TestToolPlugin
+        await manager.initialize()
+        original = manager.registry.get_plugin("tool")
+        original.shutdown = AsyncMock()
+        
+        await manager.reload_plugin("tool")
+    
+    original.shutdown.assert_awaited_once()
+    reloaded = manager.registry.get_plugin("tool")
+    assert isinstance(reloaded, TestToolPlugin)
+    assert reloaded is not original
+    assert manager.get_plugin_state("tool") == PluginState.ACTIVE
+    assert "tool" in manager.get_available_tools()
+    await manager.shutdown()
 
 def test_plugin_config_clearing(mcp_manager):
     """Test configuration clearing."""
@@ -201,7 +236,7 @@ def test_plugin_config_clearing(mcp_manager):
         mcp_manager.clear_plugin_config("test")
         mock_clear.assert_called_once_with("test")
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
 async def test_error_handling(mcp_manager):
     """Test error handling in manager operations."""
     # Test initialization error
@@ -216,7 +251,15 @@ async def test_error_handling(mcp_manager):
         with pytest.raises(Exception):
             await mcp_manager.shutdown()
 
-@pytest.mark.asyncio
+@pytest.mark.asyncio(loop_scope="module")
+async def test_repeated_shutdown(mcp_manager):
+    """Test that shutting down twice only stops the registry once."""
+    with patch("deepseek_engineer.mcp.registry.PluginRegistry.shutdown") as mock_shutdown:
+        await mcp_manager.shutdown()
+        await mcp_manager.shutdown()
+        mock_shutdown.assert_called_once()
+
+@pytest.mark.asyncio(loop_scope="module")
 async def test_plugin_directory_management(mcp_manager):
     """Test plugin directory management."""
     new_dir = Path("/test/plugins")
@@ -226,24 +269,11 @@ async def test_plugin_directory_management(mcp_manager):
         await mcp_manager.initialize()
         mock_discover.assert_called_once()
 
-@pytest.mark.asyncio
-async def test_plugin_listing(mcp_manager):
+@pytest.mark.asyncio(loop_scope="module")
+async def test_plugin_listing(mcp_manager, sample_plugin_metadatas):
     """Test plugin listing functionality."""
     with patch("deepseek_engineer.mcp.registry.PluginRegistry.list_plugins") as mock_list:
-        mock_list.return_value = [
-            create_plugin_metadata(
-                name="test1",
-                version="1.0.0",
-                description="Test 1",
-                author="Test"
-            ),
-            create_plugin_metadata(
-                name="test2",
-                version="1.0.0",
-                description="Test 2",
-                author="Test"
-            )
-        ]
+        mock_list.return_value = sample_plugin_metadatas
         
         plugins = mcp_manager.list_plugins()
         assert len(plugins) == 2
@@ -1,10 +1,11 @@
 """Tests for the MCP plugin system."""
 
 import pytest
+import os
+import shutil
 from pathlib import Path
 import json
 from datetime import datetime
-import asyncio
 from unittest.mock import Mock, patch, AsyncMock
 
 from deepseek_engineer.mcp.base import (
@@ -15,10 +16,13 @@ from deepseek_engineer.mcp.base import (
     HybridPlugin,
     PluginError,
     PluginInitError,
+    PluginConfigError,
+    SCHEMA_ERRORS,
+    compile_schema,
     load_plugin_metadata,
     create_plugin_metadata
 )
-from deepseek_engineer.mcp.loader import PluginLoader, LoadedPlugin
+from deepseek_engineer.mcp.loader import PluginLoader, LoadedPlugin, dependency_levels
 
 # Test Plugin Implementations
 class TestPlugin(MCPPlugin):
@@ -86,10 +90,10 @@ class TestToolPlugin(ToolProvider):
     def get_tool_schema(self, tool_name: str):
         return {"type": "object"}
 
-@pytest.fixture
-def temp_plugin_dir(tmp_path):
-    """Create a temporary plugin directory with metadata."""
-    plugin_dir = tmp_path / "test_plugin"
+@pytest.fixture(scope="session")
+def plugin_template(tmp_path_factory):
+    """Build the test plugin directory once per session."""
+    plugin_dir = tmp_path_factory.mktemp("plugin_template") / "test_plugin"
     plugin_dir.mkdir()
     
     # Create plugin.json
@@ -124,6 +128,27 @@ class TestPlugin(MCPPlugin):
     
     return plugin_dir
 
+@pytest.fixture
+def temp_plugin_dir(plugin_template, tmp_path):
+    """Copy the test plugin into a directory the test may modify."""
+    return Path(shutil.copytree(plugin_template, tmp_path / plugin_template.name))
+
+@pytest.fixture
+def plugin_dir_factory(tmp_path):
+    """Create metadata-only plugin directories under the test's tmp_path."""
+    def make(name: str) -> Path:
+        plugin_dir = tmp_path / name
+        plugin_dir.mkdir()
+        with open(plugin_dir / "plugin.json", "w") as f:
+            json.dump({
+                "name": name,
+                "version": "1.0.0",
+                "description": name,
+                "author": "Test"
+            }, f)
+        return plugin_dir
+    return make
+
 def test_plugin_metadata():
     """Test plugin metadata creation and serialization."""
     metadata = create_plugin_metadata(
@@ -222,28 +247,11 @@ async def test_plugin_loader(temp_plugin_dir):
     assert "test_plugin" not in loader.loaded_plugins
 
 @pytest.mark.asyncio
-async def test_plugin_dependencies(tmp_path):
+async def test_plugin_dependencies(plugin_dir_factory, tmp_path):
     """Test plugin dependency resolution."""
     # Create two plugins with a dependency relationship
-    plugin1_dir = tmp_path / "plugin1"
-    plugin1_dir.mkdir()
-    with open(plugin1_dir / "plugin.json", "w") as f:
-        json.dump({
-            "name": "plugin1",
-            "version": "1.0.0",
-            "description": "Plugin 1",
-            "author": "Test"
-        }, f)
-    
-    plugin2_dir = tmp_path / "plugin2"
-    plugin2_dir.mkdir()
-    with open(plugin2_dir / "plugin.json", "w") as f:
-        json.dump({
-            "name": "plugin2",
-            "version": "1.0.0",
-            "description": "Plugin 2",
-            "author": "Test"
-        }, f)
+    plugin1_dir = plugin_dir_factory("plugin1")
+    plugin2_dir = plugin_dir_factory("plugin2")
     
     loader = PluginLoader([tmp_path])
     
@@ -281,8 +289,11 @@ async def test_plugin_reload(temp_plugin_dir):
     
     assert reloaded is not None
     assert reloaded.instance is not original_instance
+    # The module is unchanged, so its class is reused rather than re-imported
+    assert type(reloaded.instance) is type(original_instance)
 
-def test_error_handling(tmp_path):
+@pytest.mark.asyncio
+async def test_error_handling(tmp_path):
     """Test error handling in plugin operations."""
     # Test invalid plugin.json
     bad_plugin_dir = tmp_path / "bad_plugin"
@@ -296,4 +307,174 @@ def test_error_handling(tmp_path):
     # Test missing plugin module
     loader = PluginLoader([tmp_path])
     with pytest.raises(PluginError):
-        asyncio.run(loader.load_plugin(bad_plugin_dir))
\ No newline at end of file
+        await loader.load_plugin(bad_plugin_dir)
+
+def test_dependency_levels():
+    """Test plugins are grouped into levels after their dependencies."""
+    deps = {"a": set(), "b": {"a"}, "c": {"a", "missing"}, "d": {"b", "c"}}
+    assert dependency_levels(deps) == [["a"], ["b", "c"], ["d"]]
+    
+    # Plugins in a cycle come last, one per level
+    cyclic = {"a": {"b"}, "b": {"a"}, "c": set()}
+    assert dependency_levels(cyclic) == [["c"], ["a"], ["b"]]
+
+@pytest.mark.asyncio
+async def test_load_all_plugins(plugin_dir_factory, tmp_path):
+    """Test loading all discovered plugins respects dependencies."""
+    for name in ["plugin1", "plugin2", "plugin3"]:
+        plugin_dir_factory(name)
+    
+    loader = PluginLoader([tmp_path])
+    configs = {
+        "plugin2": {
+            "dependencies": {
+                "plugin1": {"path": str(tmp_path / "plugin1")}
+            }
+        }
+    }
+    
+    with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load, \
+         patch("deepseek_engineer.mcp.loader.load_plugin_metadata",
+               wraps=load_plugin_metadata) as mock_metadata:
+        mock_load.return_value = TestPlugin
+        await loader.load_all_plugins(configs)
+    
+    assert set(loader.loaded_plugins) == {"plugin1", "plugin2", "plugin3"}
+    assert loader.get_plugin("plugin2").dependencies == {"plugin1"}
+    assert mock_load.call_count == 3
+    
+    # Each plugin.json is parsed once during discovery; the dependency
+    # lookup by path hits the metadata cache
+    assert mock_metadata.call_count == 3
+
+def test_plugin_metadata_cache(temp_plugin_dir):
+    """Test plugin metadata is reused until plugin.json changes."""
+    loader = PluginLoader([temp_plugin_dir.parent])
+    
+    metadata = loader._get_metadata(temp_plugin_dir)
+    assert loader._get_metadata(temp_plugin_dir) is metadata
+    
+    # Rewriting plugin.json with a new mtime re-parses it
+    metadata_file = temp_plugin_dir / "plugin.json"
+    data = json.loads(metadata_file.read_text())
+    data["version"] = "2.0.0"
+    metadata_file.write_text(json.dumps(data))
+    stat = metadata_file.stat()
+    os.utime(metadata_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    
+    reloaded = loader._get_metadata(temp_plugin_dir)
+    assert reloaded is not metadata
+    assert reloaded.version == "2.0.0"
+
+class SchemaPlugin(MCPPlugin):
+    """Plugin whose configuration is checked by a class-level schema."""
+    config_schema = {
+        "type": "object",
+        "properties": {"port": {"type": "integer"}},
+        "required": ["port"]
+    }
+    async def initialize(self): pass
+    async def shutdown(self): pass
+    def get_capabilities(self): return {}
+
+def test_config_schema():
+    """Test class-level configuration schemas."""
+    metadata = create_plugin_metadata(
+        name="schema",
+        version="1.0.0",
+        description="Schema plugin",
+        author="Test"
+    )
+    
+    plugin = SchemaPlugin(metadata, {"port": 8080})
+    assert plugin.config["port"] == 8080
+    
+    with pytest.raises(PluginConfigError):
+        SchemaPlugin(metadata, {"port": "8080"})
+    
+    # The schema is compiled once per class
+    assert SchemaPlugin._get_config_validator() is SchemaPlugin._get_config_validator()
+
+@pytest.mark.parametrize(
+    "use_fastjsonschema", [True, False], ids=["fastjsonschema", "jsonschema"]
+)
+def test_compile_schema(monkeypatch, use_fastjsonschema):
+    """Test schemas validate the same with and without fastjsonschema."""
+    if use_fastjsonschema:
+        pytest.importorskip("fastjsonschema")
+    else:
+        monkeypatch.setattr("deepseek_engineer.mcp.base.fastjsonschema", None)
+    draft7 = "http://json-schema.org/draft-07/schema#"
+    schema = {"type": "array", "prefixItems": [{"type": "integer"}]}
+    
+    # Schemas without $schema follow draft 2020-12
+    validate = compile_schema(schema)
+    validate([1])
+    with pytest.raises(SCHEMA_ERRORS):
+        validate(["a"])
+    
+    # Draft 7 doesn't know prefixItems
+    validate = compile_schema({"$schema": draft7, **schema})
+    validate(["a"])
+    with pytest.raises(SCHEMA_ERRORS):
+        validate("a")
+    
+    for invalid in ({"type": 5}, {"$schema": draft7, "type": 5}):
+        with pytest.raises(PluginError):
+            compile_schema(invalid)
+
+def test_plugin_class_cache(temp_plugin_dir):
+    """Test plugin classes are reused until the module changes."""
+    loader = PluginLoader([temp_plugin_dir.parent])
+    module_file = temp_plugin_dir / "plugin.py"
+    
+    # Unchanged module reuses the cached class
+    plugin_class = loader._load_plugin_module(temp_plugin_dir)
+    assert loader._load_plugin_module(temp_plugin_dir) is plugin_class
+    
+    # Modified module is executed again
+    mtime_ns = module_file.stat().st_mtime_ns
+    os.utime(module_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    reloaded_class = loader._load_plugin_module(temp_plugin_dir)
+    assert reloaded_class is not plugin_class
+    
+    # Edits within the timestamp granularity are caught by the size
+    with open(module_file, "a") as f:
+        f.write("\n# edited\n")
+    os.utime(module_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    assert loader._load_plugin_module(temp_plugin_dir) is not reloaded_class
+
+@pytest.mark.asyncio
+async def test_plugin_unload_order():
+    """Test dependents are shut down before their dependencies."""
+    shutdown_order = []
+    
+    class OrderedPlugin(TestPlugin):
+        async def shutdown(self):
+            shutdown_order.append(self.metadata.name)
+    
+    loader = PluginLoader()
+    # base <- middle <- top, and top also depends on base directly
+    for name, deps in [("base", set()), ("middle", {"base"}),
+                       ("top", {"base", "middle"}), ("other", set())]:
+        metadata = create_plugin_metadata(
+            name=name,
+            version="1.0.0",
+            description="Test",
+            author="Test"
+        )
+        loader.loaded_plugins[name] = LoadedPlugin(
+            metadata=metadata,
+            instance=OrderedPlugin(metadata, {}),
+            path=Path("/test"),
+            dependencies=deps
+        )
+    
+    await loader.unload_plugin("middle")
+    assert shutdown_order == ["top", "middle"]
+    assert set(loader.loaded_plugins) == {"base", "other"}
+    
+    shutdown_order.clear()
+    await loader.shutdown()
+    assert sorted(shutdown_order) == ["base", "other"]
+    assert not loader.loaded_plugins
@@ -190,6 +190,78 @@ async def test_tool_provider(registry, tool_plugin):
     result = await registry.execute_tool("tool", "test", {})
     assert result["result"] == "success"
 
+class SchemaToolPlugin(TestToolPlugin):
+    """Tool provider with an argument schema."""
+    schema_calls = 0
+    def get_tool_schema(self, name):
+        SchemaToolPlugin.schema_calls += 1
+        return {"type": "object", "required": ["path"]}
+
+@pytest.mark.asyncio
+async def test_tool_argument_validation(registry):
+    """Test tool arguments are checked against a schema compiled once."""
+    metadata = create_plugin_metadata(
+        name="schema_tool",
+        version="1.0.0",
+        description="Schema Tool Plugin",
+        author="Test"
+    )
+    await registry.register_plugin(LoadedPlugin(
+        metadata=metadata,
+        instance=SchemaToolPlugin(metadata),
+        path=Path("/test"),
+        dependencies=set()
+    ))
+    SchemaToolPlugin.schema_calls = 0
+    
+    result = await registry.execute_tool("schema_tool", "test", {"path": "a"})
+    assert result["result"] == "success"
+    with pytest.raises(PluginError):
+        await registry.execute_tool("schema_tool", "test", {})
+    assert SchemaToolPlugin.schema_calls == 1
+
+class BadSchemaToolPlugin(TestToolPlugin):
+    """Tool provider with an invalid argument schema."""
+    def get_tool_schema(self, name):
+        return {"type": 5}
+
+@pytest.mark.asyncio
+async def test_invalid_tool_schema(registry):
+    """Test an invalid tool schema is reported as a plugin error."""
+    metadata = create_plugin_metadata(
+        name="bad_schema_tool",
+        version="1.0.0",
+        description="Bad Schema Tool Plugin",
+        author="Test"
+    )
+    await registry.register_plugin(LoadedPlugin(
+        metadata=metadata,
+        instance=BadSchemaToolPlugin(metadata),
+        path=Path("/test"),
+        dependencies=set()
+    ))
+    
+    with pytest.raises(PluginError, match="Invalid argument schema"):
+        await registry.execute_tool("bad_schema_tool", "test", {})
+
+@pytest.mark.asyncio
+async def test_bulk_resources(registry, resource_plugin):
+    """Test fetching several resources in one call."""
+    await registry.register_plugin(resource_plugin)
+    
+    uris = ["test://a", "test://b"]
+    resources = await registry.get_resources_bulk("resource", uris)
+    assert resources == [{"uri": "test://a"}, {"uri": "test://b"}]
+    
+    # Providers with a batch API get all URIs at once
+    instance = resource_plugin.instance
+    instance.get_resources_bulk = AsyncMock(return_value=[{"uri": "batched"}])
+    assert await registry.get_resources_bulk("resource", uris) == [{"uri": "batched"}]
+    instance.get_resources_bulk.assert_awaited_once_with(uris)
+    
+    with pytest.raises(PluginError):
+        await registry.get_resources_bulk("unknown", uris)
+
 @pytest.mark.asyncio
 async def test_plugin_discovery(registry, tmp_path):
     """Test plugin discovery and loading."""
@@ -217,6 +289,129 @@ async def test_plugin_discovery(registry, tmp_path):
     assert "test" in registry.plugins
     assert registry.get_plugin_state("test") == PluginState.ACTIVE
 
+@pytest.mark.asyncio
+async def test_lazy_plugin_activation(tmp_path):
+    """Test lazily loaded plugins are imported and activated on first use."""
+    registry = PluginRegistry(lazy=True)
+    plugin_dir = tmp_path / "plugins"
+    tool_dir = plugin_dir / "tool"
+    tool_dir.mkdir(parents=True)
+    
+    with open(tool_dir / "plugin.json", "w") as f:
+        json.dump({
+            "name": "tool",
+            "version": "1.0.0",
+            "description": "Tool Plugin",
+            "author": "Test"
+        }, f)
+    
+    registry.add_plugin_directory(plugin_dir)
+    
+    with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load:
+        mock_load.return_value = TestToolPlugin
+        await registry.discover_and_load()
+        
+        # Only the metadata has been read
+        mock_load.assert_not_called()
+        assert registry.get_plugin_state("tool") == PluginState.REGISTERED
+        assert registry.get_tools() == {}
+        
+        result = await registry.execute_tool("tool", "test", {})
+        assert result["result"] == "success"
+        await registry.execute_tool("tool", "test", {})
+        mock_load.assert_called_once()
+    
+    assert registry.get_plugin_state("tool") == PluginState.ACTIVE
+    assert "tool" in registry.get_tools()
+
+@pytest.mark.asyncio
+async def test_lazy_plugin_dependencies(tmp_path):
+    """Test lazy plugins activate their lazy dependencies first."""
+    initialized = []
+    
+    class BasePlugin(TestPlugin):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            # Plugins are constructed on the event loop
+            asyncio.get_running_loop()
+        
+        async def initialize(self):
+            initialized.append("base")
+    
+    class AppPlugin(TestToolPlugin):
+        async def initialize(self):
+            initialized.append("app")
+    
+    registry = PluginRegistry(lazy=True)
+    plugin_dir = tmp_path / "plugins"
+    for name in ("base", "app"):
+        (plugin_dir / name).mkdir(parents=True)
+        with open(plugin_dir / name / "plugin.json", "w") as f:
+            json.dump({
+                "name": name,
+                "version": "1.0.0",
+                "description": "Test Plugin",
+                "author": "Test"
+            }, f)
+    registry.add_plugin_directory(plugin_dir)
+    
+    classes = {"base": BasePlugin, "app": AppPlugin}
+    configs = {"app": {"dependencies": {"base": {"path": str(plugin_dir / "base")}}}}
+    with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load:
+        mock_load.side_effect = lambda path: classes[path.name]
+        await registry.discover_and_load(configs)
+        
+        assert sorted(registry.get_pending_plugins()) == ["app", "base"]
+        assert registry.get_plugin("app") is None
+        
+        await registry.execute_tool("app", "test", {})
+    
+    assert initialized == ["base", "app"]
+    assert registry.get_pending_plugins() == []
+    app = registry.get_plugin("app")
+    assert isinstance(app, AppPlugin)
+    assert await registry.activate_plugin("app") is app
+    
+    # The loaded plugin itself stays untouched
+    loaded = registry.get_plugin_info("app").loaded
+    assert loaded.instance is None
+    with pytest.raises(AttributeError):
+        loaded.instance = app
+
+@pytest.mark.asyncio
+async def test_plugin_reload_dependents(tmp_path):
+    """Test reloading a plugin re-registers the plugins depending on it."""
+    registry = PluginRegistry()
+    plugin_dir = tmp_path / "plugins"
+    for name in ("base", "app"):
+        (plugin_dir / name).mkdir(parents=True)
+        with open(plugin_dir / name / "plugin.json", "w") as f:
+            json.dump({
+                "name": name,
+                "version": "1.0.0",
+                "description": "Test Plugin",
+                "author": "Test"
+            }, f)
+    registry.add_plugin_directory(plugin_dir)
+    
+    classes = {"base": TestPlugin, "app": TestToolPlugin}
+    configs = {"app": {"dependencies": {"base": {"path": str(plugin_dir / "base")}}}}
+    with patch("deepseek_engineer.mcp.loader.PluginLoader._load_plugin_module") as mock_load:
+        mock_load.side_effect = lambda path: classes[path.name]
+        await registry.discover_and_load(configs)
+        before = {name: registry.get_plugin(name) for name in ("base", "app")}
+        
+        await registry.reload_plugin("base")
+    
+    for name, instance in before.items():
+        assert registry.get_plugin(name) is not instance
+        assert registry.get_plugin_state(name) == PluginState.ACTIVE
+    assert registry.get_plugin_info("app").loaded.dependencies == {"base"}
+    assert "app" in registry.get_tools()
+    
+    with pytest.raises(PluginError):
+        await registry.reload_plugin("unknown")
+
 @pytest.mark.asyncio
 async def test_plugin_dependencies(registry, test_plugin, tool_plugin):
     """Test plugin dependency handling."""
@@ -231,6 +426,83 @@ async def test_plugin_dependencies(registry, test_plugin, tool_plugin):
     with pytest.raises(Exception):
         await registry.unregister_plugin(test_plugin.metadata.name)
 
+def _loaded(name, instance_cls=TestPlugin, dependencies=()):
+    """Create a LoadedPlugin with the given dependencies."""
+    metadata = create_plugin_metadata(
+        name=name,
+        version="1.0.0",
+        description=name,
+        author="Test"
+    )
+    return LoadedPlugin(
+        metadata=metadata,
+        instance=instance_cls(metadata),
+        path=Path("/test") / name,
+        dependencies=frozenset(dependencies)
+    )
+
+@pytest.mark.asyncio
+async def test_register_plugins_levels(registry):
+    """Test bulk registration initializes dependencies first and levels concurrently."""
+    order = []
+    running = set()
+    overlapped = []
+    
+    class TrackedPlugin(TestPlugin):
+        async def initialize(self):
+            running.add(self.metadata.name)
+            await asyncio.sleep(0)
+            overlapped.append(len(running) > 1)
+            running.discard(self.metadata.name)
+            order.append(self.metadata.name)
+    
+    class FailingPlugin(TestPlugin):
+        async def initialize(self):
+            raise RuntimeError("boom")
+    
+    errors = await registry.register_plugins([
+        _loaded("app", TrackedPlugin, {"base1", "base2"}),
+        _loaded("base1", TrackedPlugin),
+        _loaded("base2", TrackedPlugin),
+        _loaded("broken", FailingPlugin),
+        _loaded("needs_broken", TrackedPlugin, {"broken"})
+    ])
+    
+    # Independent plugins initialize together; dependents wait for them
+    assert order[-1] == "app"
+    assert set(order[:2]) == {"base1", "base2"}
+    assert any(overlapped)
+    assert registry.get_plugin_state("app") == PluginState.ACTIVE
+    
+    # Failures are reported and dependents of failed plugins are skipped
+    assert set(errors) == {"broken", "needs_broken"}
+    assert registry.get_plugin_state("broken") == PluginState.ERROR
+    assert "needs_broken" not in registry.plugins
+
+@pytest.mark.asyncio
+async def test_list_plugins_cache(registry, test_plugin, tool_plugin):
+    """Test plugin listing is cached until registrations change."""
+    await registry.register_plugin(test_plugin)
+    plugins = registry.list_plugins()
+    assert registry.list_plugins() is plugins
+    
+    await registry.register_plugin(tool_plugin)
+    assert [m.name for m in registry.list_plugins()] == ["test", "tool"]
+    
+    await registry.unregister_plugin("test")
+    assert [m.name for m in registry.list_plugins()] == ["tool"]
+
+def test_remove_state_listener(registry):
+    """Test removing state listeners, including unknown ones."""
+    listener = Mock()
+    registry.add_state_listener("test", listener)
+    
+    registry.remove_state_listener("test", listener)
+    registry.remove_state_listener("test", listener)
+    registry.remove_state_listener("missing", listener)
+    
+    assert "test" not in registry._state_listeners
+
 @pytest.mark.asyncio
 async def test_registry_shutdown(registry, test_plugin, tool_plugin):
     """Test registry shutdown."""
@@ -242,6 +514,20 @@ async def test_registry_shutdown(registry, test_plugin, tool_plugin):
     assert len(registry.plugins) == 0
     assert len(registry.get_active_plugins()) == 0
 
+@pytest.mark.asyncio
+async def test_registry_shutdown_errors(registry, test_plugin, tool_plugin):
+    """Test a failing plugin shutdown doesn't stop the others."""
+    await registry.register_plugin(test_plugin)
+    await registry.register_plugin(tool_plugin)
+    test_plugin.instance.shutdown = AsyncMock(side_effect=Exception("boom"))
+    tool_plugin.instance.shutdown = AsyncMock()
+    
+    await registry.shutdown()
+    
+    assert len(registry.plugins) == 0
+    tool_plugin.instance.shutdown.assert_awaited()
+    assert registry.get_tools() == {}
+
 def test_plugin_info():
     """Test PluginInfo creation and state tracking."""
     metadata = create_plugin_metadata(
@@ -280,6 +566,18 @@ async def test_capability_caching(registry, resource_plugin, tool_plugin):
     await registry.register_plugin(tool_plugin)
     tools = registry.get_tools()
     assert "tool" in tools
+    
+    # Registering a tool provider keeps cached resources
+    assert registry.get_resources() is resources1
+    
+    # Cached listings can't be modified by callers
+    with pytest.raises(TypeError):
+        resources1["other"] = []
+    
+    # Unregistering a resource provider rebuilds the resource listing
+    await registry.unregister_plugin("resource")
+    assert registry.get_resources() is not resources1
+    assert "resource" not in registry.get_resources()
 
 @pytest.mark.asyncio
 async def test_error_handling(registry):
@@ -307,4 +605,61 @@ async def test_error_handling(registry):
     
     await registry.register_plugin(plugin)
     with pytest.raises(PluginError):
-        await registry.register_plugin(plugin)
\ No newline at end of file
+        await registry.register_plugin(plugin)
+
+@pytest.mark.asyncio
+async def test_capability_order(registry):
+    """Test capability listings follow registration order."""
+    names = ["zeta", "alpha", "mid", "beta"]
+    for name in names:
+        await registry.register_plugin(_loaded(name, TestToolPlugin))
+    
+    assert list(registry.get_tools()) == names
+
+@pytest.mark.asyncio
+async def test_capabilities_exclude_inactive(registry, resource_plugin, tool_plugin):
+    """Test only active providers contribute capabilities."""
+    await registry.register_plugin(resource_plugin)
+    await registry.register_plugin(tool_plugin)
+    
+    assert "resource" in registry.get_resources()
+    await registry._set_plugin_state("resource", PluginState.ERROR, "failed")
+    
+    assert "resource" not in registry.get_resources()
+    assert "tool" in registry.get_tools()
+    assert "tool" not in registry.get_resources()
+    assert "resource" not in registry.get_tools()
+
+@pytest.mark.asyncio
+async def test_per_plugin_capability_cache(registry, resource_plugin):
+    """Test resource listings are cached per plugin."""
+    await registry.register_plugin(resource_plugin)
+    instance = resource_plugin.instance
+    instance.list_resources = Mock(return_value=[{"name": "test"}])
+    
+    registry.get_resources()
+    
+    metadata = create_plugin_metadata(
+        name="resource2",
+        version="1.0.0",
+        description="Resource Plugin",
+        author="Test"
+    )
+    await registry.register_plugin(LoadedPlugin(
+        metadata=metadata,
+        instance=TestResourcePlugin(metadata),
+        path=Path("/test"),
+        dependencies=set()
+    ))
+    
+    # Registering another provider doesn't re-query existing ones
+    resources = registry.get_resources()
+    assert set(resources) == {"resource", "resource2"}
+    assert instance.list_resources.call_count == 1
+    
+    # Leaving the active state drops the plugin's cached listing
+    await registry._set_plugin_state("resource", PluginState.ERROR, "failed")
+    assert registry.get_plugin_info("resource").cached_resources is None
+    await registry._set_plugin_state("resource", PluginState.ACTIVE)
+    registry.get_resources()
+    assert instance.list_resources.call_count == 2
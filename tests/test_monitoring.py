@@ -7,6 +7,7 @@ import logging
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 import time
+import threading
 from queue import Queue
 import psutil
 
@@ -27,7 +28,9 @@ def temp_log_file(tmp_path):
 @pytest.fixture
 def monitoring_system(temp_log_file):
     """Create a MonitoringSystem instance with test configuration."""
-    return MonitoringSystem(log_path=temp_log_file)
+    system = MonitoringSystem(log_path=temp_log_file)
+    yield system
+    system.shutdown()
 
 def test_metric_recording(monitoring_system):
     """Test recording and retrieving metrics."""
@@ -41,6 +44,9 @@ def test_metric_recording(monitoring_system):
     assert metrics[0].value == 42.0
     assert metrics[1].value == 43.0
     assert all(m.labels["label"] == "test" for m in metrics)
+    
+    # Identical label sets are stored once
+    assert metrics[0].labels is metrics[1].labels
 
 def test_event_recording(monitoring_system):
     """Test recording and retrieving events."""
@@ -84,6 +90,7 @@ def test_metrics_aggregator():
     # Test retrieval
     metrics = aggregator.get_metrics("test")
     assert len(metrics) == 2
+    assert metrics[0].timestamp == metric1.timestamp
     
     # Test time filtering
     future = datetime.now() + timedelta(hours=1)
@@ -98,6 +105,31 @@ def test_metrics_aggregator():
     aggregator.clear_old_metrics(datetime.now() + timedelta(minutes=1))
     assert len(aggregator.get_metrics("test")) == 0
 
+def test_metrics_aggregator_time_range():
+    """Test time range queries over out-of-order measurements."""
+    aggregator = MetricsAggregator()
+    base = datetime(2025, 1, 1, 12, 0)
+    for minutes in (0, 2, 1, 3):
+        aggregator.add_metric(
+            Metric("test", float(minutes), base + timedelta(minutes=minutes), {})
+        )
+    
+    # Measurements are kept in timestamp order
+    assert [m.value for m in aggregator.get_metrics("test")] == [0.0, 1.0, 2.0, 3.0]
+    
+    # Range bounds are inclusive
+    filtered = aggregator.get_metrics(
+        "test",
+        start_time=base + timedelta(minutes=1),
+        end_time=base + timedelta(minutes=2)
+    )
+    assert [m.value for m in filtered] == [1.0, 2.0]
+    
+    # Cleanup drops measurements at or before the cutoff
+    aggregator.clear_old_metrics(base + timedelta(minutes=1))
+    assert [m.value for m in aggregator.get_metrics("test")] == [2.0, 3.0]
+    assert len(aggregator.metrics["test"]) == 2
+
 def test_event_processor():
     """Test EventProcessor functionality."""
     processor = EventProcessor(max_events=2)
@@ -121,6 +153,12 @@ def test_event_processor():
     error_events = processor.get_events(level="ERROR")
     assert len(error_events) == 1
     assert error_events[0].name == "test2"
+    
+    # Evicted events leave the level index too
+    processor.add_event(Event("test4", datetime.now(), {}, "INFO"))
+    assert processor.get_events(level="ERROR") == []
+    assert "ERROR" not in processor._by_level
+    assert [e.name for e in processor.get_events(level="INFO")] == ["test3", "test4"]
 
 @patch('psutil.Process')
 @patch('psutil.cpu_percent')
@@ -144,6 +182,24 @@ def test_performance_monitor(mock_disk, mock_memory, mock_cpu, mock_process):
     assert metrics["process_cpu_percent"] == 30.0
     assert metrics["process_memory_percent"] == 40.0
 
+@patch('psutil.Process')
+@patch('psutil.cpu_percent')
+@patch('psutil.virtual_memory')
+@patch('psutil.disk_usage')
+def test_performance_monitor_cache(mock_disk, mock_memory, mock_cpu, mock_process):
+    """Test system metrics are reused within the TTL."""
+    mock_cpu.return_value = 50.0
+    
+    monitor = PerformanceMonitor(ttl=60)
+    assert monitor.get_system_metrics() == monitor.get_system_metrics()
+    mock_cpu.assert_called_once_with(interval=None)
+    mock_process.assert_called_once()
+    
+    # A zero TTL samples on every call
+    monitor.ttl = 0
+    monitor.get_system_metrics()
+    assert mock_cpu.call_count == 2
+
 def test_time_measurement(monitoring_system):
     """Test operation time measurement."""
     with monitoring_system.measure_time("test_operation", {"type": "test"}):
@@ -163,8 +219,12 @@ def test_system_status(monitoring_system):
     assert "process_info" in status
     assert "recent_errors" in status
 
-def test_metrics_export(monitoring_system, tmp_path):
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_metrics_export(monitoring_system, tmp_path, monkeypatch, use_orjson):
     """Test metrics export functionality."""
+    if not use_orjson:
+        monkeypatch.setattr("deepseek_engineer.core.monitoring.orjson", None)
+    
     # Record some metrics
     monitoring_system.record_metric("test", 1.0)
     monitoring_system.record_metric("test", 2.0)
@@ -179,6 +239,7 @@ def test_metrics_export(monitoring_system, tmp_path):
     
     assert "test" in data
     assert len(data["test"]) == 2
+    datetime.fromisoformat(data["test"][0]["timestamp"])
 
 def test_events_export(monitoring_system, tmp_path):
     """Test events export functionality."""
@@ -198,6 +259,34 @@ def test_events_export(monitoring_system, tmp_path):
     assert data[0]["name"] == "test1"
     assert data[1]["name"] == "test2"
 
+@pytest.mark.parametrize("use_orjson", [True, False], ids=["orjson", "stdlib"])
+def test_jsonl_export(monitoring_system, tmp_path, monkeypatch, use_orjson):
+    """Test line-delimited metric and event exports."""
+    if not use_orjson:
+        monkeypatch.setattr("deepseek_engineer.core.monitoring.orjson", None)
+    
+    monitoring_system.record_metric("a", 1.0)
+    monitoring_system.record_metric("b", 2.0)
+    monitoring_system.record_event("test1", {"data": 1})
+    
+    metrics_path = tmp_path / "metrics.jsonl"
+    monitoring_system.export_metrics(metrics_path, format="jsonl")
+    with open(metrics_path) as f:
+        metrics = [json.loads(line) for line in f]
+    # The background worker may have recorded system metrics as well
+    recorded = [m for m in metrics if m["name"] in ("a", "b")]
+    assert [(m["name"], m["value"]) for m in recorded] == [("a", 1.0), ("b", 2.0)]
+    datetime.fromisoformat(recorded[0]["timestamp"])
+    
+    events_path = tmp_path / "events.jsonl"
+    monitoring_system.export_events(events_path, format="jsonl")
+    with open(events_path) as f:
+        events = [json.loads(line) for line in f]
+    assert [e["name"] for e in events] == ["test1"]
+    
+    with pytest.raises(ValueError):
+        monitoring_system.export_events(events_path, format="csv")
+
 def test_logging_setup(temp_log_file):
     """Test logging configuration."""
     monitoring_system = MonitoringSystem(log_path=temp_log_file)
@@ -206,16 +295,32 @@ def test_logging_setup(temp_log_file):
     test_message = "Test log message"
     monitoring_system.logger.info(test_message)
     
+    # Records are written by a background listener; shutdown flushes them
+    monitoring_system.shutdown()
+    
     # Verify message was logged to file
     with open(temp_log_file) as f:
         log_content = f.read()
     assert test_message in log_content
 
+def test_background_task(monitoring_system):
+    """Test submitted tasks run on the background worker."""
+    done = threading.Event()
+    ran_on = []
+    
+    def task():
+        ran_on.append(threading.current_thread())
+        done.set()
+    
+    monitoring_system.submit(task)
+    assert done.wait(5)
+    assert ran_on == [monitoring_system._worker_thread]
+
 @patch('threading.Thread')
 def test_background_worker(mock_thread, monitoring_system):
     """Test background worker initialization."""
     assert mock_thread.called
-    assert monitoring_system._worker_queue is not None
+    assert monitoring_system._worker_deque is not None
     
     # Verify worker was started as daemon
     mock_thread.assert_called_with(
@@ -1,18 +1,36 @@
 """Tests for the SecurityManager class."""
 
 import pytest
+import os
+import re
 from pathlib import Path
 import json
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from deepseek_engineer.core.security_manager import (
     SecurityManager,
     SecurityConfig,
     AccessDenied,
     RateLimitExceeded,
-    InvalidInput
+    InvalidInput,
+    _pattern_literal,
+    _read_config_file,
+    _suffix,
+    _trie_regex
 )
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _write_json(path: Path, data):
+    """Write data to a JSON file, serializing with orjson when installed."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(data))
+    else:
+        path.write_text(json.dumps(data))
+
 @pytest.fixture
 def temp_config_file(tmp_path):
     """Create a temporary security config file."""
@@ -29,15 +47,19 @@ def temp_config_file(tmp_path):
     }
     
     config_file = tmp_path / "security_config.json"
-    with open(config_file, 'w') as f:
-        json.dump(config, f)
+    _write_json(config_file, config)
     
     return config_file
 
 @pytest.fixture
-def security_manager(temp_config_file):
+def clock():
+    """Fake monotonic clock that tests advance instead of sleeping."""
+    return [1000.0]
+
+@pytest.fixture
+def security_manager(temp_config_file, clock):
     """Create a SecurityManager instance with test configuration."""
-    return SecurityManager(config_path=temp_config_file)
+    return SecurityManager(config_path=temp_config_file, time_fn=lambda: clock[0])
 
 def test_config_loading(temp_config_file):
     """Test security configuration loading."""
@@ -47,6 +69,23 @@ def test_config_loading(temp_config_file):
     assert len(manager.config.blocked_paths) > 0
     assert len(manager.config.allowed_extensions) > 0
     assert len(manager.config.blocked_extensions) > 0
+    
+    # Configurations are immutable
+    with pytest.raises(AttributeError):
+        manager.config.require_auth = False
+
+def test_config_file_cache(temp_config_file):
+    """Test parsed config files are reused until they change."""
+    data = _read_config_file(temp_config_file)
+    assert _read_config_file(temp_config_file) is data
+    
+    config = dict(data, rate_limit_max_requests=5)
+    _write_json(temp_config_file, config)
+    mtime_ns = temp_config_file.stat().st_mtime_ns
+    os.utime(temp_config_file, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+    
+    manager = SecurityManager(config_path=temp_config_file)
+    assert manager.config.rate_limit_max_requests == 5
 
 def test_path_validation(security_manager, tmp_path):
     """Test path validation logic."""
@@ -65,6 +104,32 @@ def test_path_validation(security_manager, tmp_path):
     # Test path outside allowed directories
     with pytest.raises(AccessDenied):
         security_manager.validate_path(Path("/usr/local/test.txt"))
+    
+    # Plain strings are accepted too
+    assert security_manager.validate_path(str(test_file)) is True
+    with pytest.raises(AccessDenied):
+        security_manager.validate_path(str(tmp_path / "test.exe"))
+    
+    # Directories only cover paths inside them, not siblings sharing a prefix
+    assert security_manager.validate_path(tmp_path) is True
+    with pytest.raises(AccessDenied):
+        security_manager.validate_path(Path(f"{tmp_path}_other") / "test.txt")
+
+@pytest.mark.parametrize("relative,message", [
+    ("test.exe", "is blocked"),
+    ("test.md", "is not allowed"),
+], ids=["blocked_extension", "unlisted_extension"])
+def test_path_denial_reasons(security_manager, tmp_path, relative, message):
+    """Test rejected paths report the check that failed."""
+    with pytest.raises(AccessDenied, match=message):
+        security_manager.validate_path(tmp_path / relative)
+
+@pytest.mark.parametrize("name", [
+    "a.txt", "archive.tar.gz", ".bashrc", "trailing.", "noext", "dir.d/file"
+])
+def test_suffix(name):
+    """Test suffixes of path strings match PurePath.suffix."""
+    assert _suffix(name) == Path(name).suffix
 
 def test_content_validation(security_manager):
     """Test content validation logic."""
@@ -90,8 +155,56 @@ def test_content_validation(security_manager):
     large_content = "x" * (security_manager.config.max_file_size + 1)
     with pytest.raises(InvalidInput):
         security_manager.validate_content(large_content)
+    
+    # The limit counts UTF-8 bytes, not characters
+    max_size = security_manager.config.max_file_size
+    assert security_manager.validate_content("é" * (max_size // 2)) is True
+    with pytest.raises(InvalidInput):
+        security_manager.validate_content("é" * (max_size // 2 + 1))
+
+def test_bytes_content_validation(security_manager):
+    """Test bytes-like content is validated like the text it encodes."""
+    assert security_manager.validate_content(b"Hello, world!") is True
+    assert security_manager.validate_content(bytearray(b"print('hi')")) is True
+    
+    with pytest.raises(InvalidInput, match=r"sudo"):
+        security_manager.validate_content(b"sudo apt-get install")
+    with pytest.raises(InvalidInput, match=r"chmod"):
+        security_manager.validate_content(memoryview(b"chmod   777 script"))
+    
+    max_size = security_manager.config.max_file_size
+    with pytest.raises(InvalidInput, match=r"maximum size"):
+        security_manager.validate_content(b"x" * (max_size + 1))
+
+def test_dangerous_pattern_reporting(security_manager):
+    """Test the matching dangerous pattern is named in the error."""
+    with pytest.raises(InvalidInput, match=r"chmod"):
+        security_manager.validate_content("chmod   777 script")
+    with pytest.raises(InvalidInput, match=r"os\\\.system"):
+        security_manager.validate_content("x = 1; os.system('ls')")
 
-def test_rate_limiting(security_manager):
+@pytest.mark.parametrize("pattern,literal", [
+    (r"sudo", "sudo"),
+    (r"eval\(", "eval("),
+    (r"os\.system", "os.system"),
+    (r"rm\s+-rf", None),
+    (r"open\([^)]*w", None),
+])
+def test_pattern_literal(pattern, literal):
+    """Test plain literal patterns are told apart from real regexes."""
+    assert _pattern_literal(pattern) == literal
+
+def test_trie_regex():
+    """Test the trie regex matches exactly the given words."""
+    words = ["sudo", "su", "subprocess.call", "eval(", "exec("]
+    regex = re.compile(_trie_regex(words))
+    assert regex.pattern.count("s") < sum(w.count("s") for w in words)
+    for word in words:
+        assert regex.fullmatch(word)
+    for other in ["sud", "s", "eval", "exe("]:
+        assert not regex.fullmatch(other)
+
+def test_rate_limiting(security_manager, clock):
     """Test rate limiting functionality."""
     identifier = "test_user"
     
@@ -103,13 +216,47 @@ def test_rate_limiting(security_manager):
     with pytest.raises(RateLimitExceeded):
         security_manager.check_rate_limit(identifier)
     
-    # Wait for window to expire
-    time.sleep(security_manager.config.rate_limit_window + 0.1)
+    # Let the window expire
+    clock[0] += security_manager.config.rate_limit_window + 0.1
     
     # Should be able to make requests again
     assert security_manager.check_rate_limit(identifier) is True
 
-def test_authentication(security_manager):
+def test_rate_limit_refill(security_manager, clock):
+    """Test rate limit tokens refill gradually over the window."""
+    identifier = "test_user"
+    limit = security_manager.config.rate_limit_max_requests
+    window = security_manager.config.rate_limit_window
+    
+    for _ in range(limit):
+        security_manager.check_rate_limit(identifier)
+    with pytest.raises(RateLimitExceeded):
+        security_manager.check_rate_limit(identifier)
+    
+    # Tokens come back at limit / window per second
+    clock[0] += 1.5 * window / limit
+    assert security_manager.check_rate_limit(identifier) is True
+    with pytest.raises(RateLimitExceeded):
+        security_manager.check_rate_limit(identifier)
+
+def test_concurrent_rate_limiting(security_manager):
+    """Test concurrent checks never let more requests through than the limit."""
+    def attempt(identifier):
+        try:
+            return security_manager.check_rate_limit(identifier)
+        except RateLimitExceeded:
+            return False
+    
+    identifiers = ["user1", "user2"] * 20
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(attempt, identifiers))
+    
+    limit = security_manager.config.rate_limit_max_requests
+    for identifier in ("user1", "user2"):
+        allowed = [r for i, r in zip(identifiers, results) if i == identifier and r]
+        assert len(allowed) == limit
+
+def test_authentication(security_manager, clock):
     """Test authentication token management."""
     # Generate token
     token = security_manager.generate_auth_token()
@@ -123,7 +270,7 @@ def test_authentication(security_manager):
         security_manager.validate_auth_token("invalid_token")
     
     # Test token expiration
-    time.sleep(security_manager.config.auth_token_expiry + 0.1)
+    clock[0] += security_manager.config.auth_token_expiry + 0.1
     with pytest.raises(AccessDenied):
         security_manager.validate_auth_token(token)
 
@@ -136,13 +283,13 @@ def test_token_revocation(security_manager):
     with pytest.raises(AccessDenied):
         security_manager.validate_auth_token(token)
 
-def test_expired_token_cleanup(security_manager):
+def test_expired_token_cleanup(security_manager, clock):
     """Test cleanup of expired tokens."""
     # Generate multiple tokens
     tokens = [security_manager.generate_auth_token() for _ in range(3)]
     
-    # Wait for expiration
-    time.sleep(security_manager.config.auth_token_expiry + 0.1)
+    # Let the tokens expire
+    clock[0] += security_manager.config.auth_token_expiry + 0.1
     
     # Clean expired tokens
     security_manager.clean_expired_tokens()
@@ -151,6 +298,12 @@ def test_expired_token_cleanup(security_manager):
     for token in tokens:
         with pytest.raises(AccessDenied):
             security_manager.validate_auth_token(token)
+    
+    # Cleanup only leaves live tokens behind
+    assert security_manager._token_expiries == []
+    live = security_manager.generate_auth_token()
+    security_manager.clean_expired_tokens()
+    assert security_manager.validate_auth_token(live) is True
 
 def test_content_hashing(security_manager):
     """Test content hashing functionality."""
@@ -159,7 +312,9 @@ def test_content_hashing(security_manager):
     hash2 = security_manager.hash_content(content)
     
     assert hash1 == hash2
-    assert len(hash1) == 64  # SHA-256 produces 64 character hex string
+    assert len(hash1) == 64  # BLAKE2b-256 produces 64 character hex string
+    assert security_manager.hash_content(content.encode()) == hash1
+    assert security_manager.hash_content("Other content") != hash1
 
 def test_security_decorators(security_manager):
     """Test security decorator functionality."""
@@ -180,6 +335,15 @@ def test_security_decorators(security_manager):
     
     with pytest.raises(AccessDenied):
         protected_function(auth_token="invalid_token")
+    with pytest.raises(AccessDenied):
+        protected_function()
+    
+    # Other arguments are passed through; the token is not
+    @security_manager.require_auth
+    def echo(*args, **kwargs):
+        return args, kwargs
+    
+    assert echo(1, key="value", auth_token=token) == ((1,), {"key": "value"})
     
     # Test security decorator
     for _ in range(security_manager.config.rate_limit_max_requests):
@@ -195,12 +359,11 @@ def test_multiple_security_managers(tmp_path):
     
     # Create different configs
     for path, window in [(config1, 1), (config2, 2)]:
-        with open(path, 'w') as f:
-            json.dump({
-                "allowed_paths": [str(tmp_path)],
-                "rate_limit_window": window,
-                "rate_limit_max_requests": 1
-            }, f)
+        _write_json(path, {
+            "allowed_paths": [str(tmp_path)],
+            "rate_limit_window": window,
+            "rate_limit_max_requests": 1
+        })
     
     manager1 = SecurityManager(config_path=config1)
     manager2 = SecurityManager(config_path=config2)